@@ -0,0 +1,84 @@
+"""
+Database maintenance commands.
+
+    python -m api.cli init-db   # create missing tables/indexes, keep data
+    python -m api.cli seed      # insert the sample data if the DB is empty
+    python -m api.cli reset     # drop everything, recreate and seed
+    python -m api.cli backfill-rollups   # rebuild daily_revenue, sandwich_rating_stats, sandwich_daily_sales
+    python -m api.cli export --start-date 2025-01-01 --end-date 2025-03-31 --format parquet --out exports/
+"""
+import argparse
+from datetime import datetime
+
+from fastapi import HTTPException
+
+from .controllers import analytics, exports
+from .dependencies.database import SessionLocal
+from .models import model_loader
+
+
+def init_db(args):
+    before = model_loader.init_db()
+    print(f"Schema version {before} -> {model_loader.SCHEMA_VERSION}")
+
+
+def seed(args):
+    model_loader.init_db()
+    model_loader.seed_initial_data()
+    print("Seed data loaded (skipped if the menu already exists).")
+
+
+def reset(args):
+    model_loader.index()
+    print("All tables dropped, recreated and seeded.")
+
+
+def backfill_rollups(args):
+    db = SessionLocal()
+    try:
+        days = analytics.rebuild_daily_revenue(db)
+        sandwiches = analytics.rebuild_rating_stats(db)
+        sales_rows = analytics.rebuild_sandwich_daily_sales(db)
+    finally:
+        db.close()
+    print(f"daily_revenue rebuilt: {days} day(s).")
+    print(f"sandwich_rating_stats rebuilt: {sandwiches} sandwich(es).")
+    print(f"sandwich_daily_sales rebuilt: {sales_rows} row(s).")
+
+
+def export(args):
+    try:
+        written = exports.write_files(
+            args.out, args.start_date, args.end_date, fmt=args.format,
+            tables=args.table, batch_size=args.batch_size,
+        )
+    except HTTPException as e:
+        raise SystemExit(e.detail)
+    for table, path in written.items():
+        print(f"{table}: {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m api.cli", description="Database maintenance commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("init-db", help="Create missing tables and indexes.").set_defaults(func=init_db)
+    commands.add_parser("seed", help="Load sample data into an empty database.").set_defaults(func=seed)
+    commands.add_parser("reset", help="Drop all tables, recreate and seed.").set_defaults(func=reset)
+    commands.add_parser("backfill-rollups", help="Rebuild the pre-aggregated tables from source rows.").set_defaults(func=backfill_rollups)
+
+    export_parser = commands.add_parser("export", help="Write orders, order_details, ratings and sandwiches as Arrow or Parquet files (needs pyarrow).")
+    export_parser.add_argument("--start-date", type=datetime.fromisoformat, help="Start datetime, inclusive (YYYY-MM-DD).")
+    export_parser.add_argument("--end-date", type=datetime.fromisoformat, help="End datetime, inclusive (YYYY-MM-DD).")
+    export_parser.add_argument("--format", choices=list(exports.FORMATS), default="parquet")
+    export_parser.add_argument("--table", action="append", choices=list(exports.TABLES), help="Only these tables (repeatable).")
+    export_parser.add_argument("--out", default="exports", help="Output directory.")
+    export_parser.add_argument("--batch-size", type=int, default=exports.DEFAULT_BATCH_SIZE)
+    export_parser.set_defaults(func=export)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
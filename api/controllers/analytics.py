@@ -1,40 +1,76 @@
+import re
 from datetime import datetime, date, time, timedelta
 from decimal import Decimal
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.dialects.mysql import match as mysql_match
 from fastapi import HTTPException, status
 
+from ..controllers import resources as resource_controller
+from ..dependencies.aggregates import increment, increment_many
+from ..dependencies.pagination import DEFAULT_PAGE_SIZE, keyset_page
+from ..models import daily_revenue as revenue_model
+from ..models import sandwich_daily_sales as daily_sales_model
+from ..models import sandwich_rating_stats as rating_stats_model
 from ..models import order_details as od_model
 from ..models import sandwiches as sand_model
 from ..models import ratings as rating_model
 from ..models import orders as order_model
 
 
-def get_least_popular_dishes(db: Session, limit: int = 5):
+def _parse_statuses(statuses: list[str] | None) -> list[order_model.OrderStatus] | None:
+    if not statuses:
+        return None
+    try:
+        return [order_model.OrderStatus(value) for value in statuses]
+    except ValueError:
+        allowed = ", ".join(s.value for s in order_model.OrderStatus)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown order status; use one of: {allowed}.",
+        )
+
+
+def _dishes_by_popularity(
+    db: Session,
+    limit: int,
+    most_popular: bool,
+    start_date: date | None,
+    end_date: date | None,
+    statuses: list[str] | None,
+):
     """
-    Return dishes sorted by how rarely they are ordered.
-    Popularity is measured by total quantity in OrderDetail.amount.
+    Sandwiches ranked by quantity ordered in [start_date, end_date] (both
+    inclusive) across orders in `statuses` (all when empty), read from the
+    sandwich_daily_sales rollup. Sandwiches never ordered count as 0.
     """
+    sales_model = daily_sales_model.SandwichDailySales
+    order_statuses = _parse_statuses(statuses)
+
+    sales = select(
+        sales_model.sandwich_id,
+        func.sum(sales_model.quantity).label("total_ordered"),
+    ).group_by(sales_model.sandwich_id)
+    if start_date is not None:
+        sales = sales.where(sales_model.day >= start_date)
+    if end_date is not None:
+        sales = sales.where(sales_model.day <= end_date)
+    if order_statuses:
+        sales = sales.where(sales_model.status.in_(order_statuses))
+    sales = sales.subquery()
+
+    total = func.coalesce(sales.c.total_ordered, 0)
     try:
         # LEFT OUTER JOIN so sandwiches with zero orders are included
         rows = (
             db.query(
                 sand_model.Sandwich.id.label("sandwich_id"),
                 sand_model.Sandwich.sandwich_name.label("sandwich_name"),
-                func.coalesce(func.sum(od_model.OrderDetail.amount), 0).label(
-                    "total_ordered"
-                ),
-            )
-            .outerjoin(
-                od_model.OrderDetail,
-                od_model.OrderDetail.sandwich_id == sand_model.Sandwich.id,
+                total.label("total_ordered"),
             )
-            .group_by(
-                sand_model.Sandwich.id,
-                sand_model.Sandwich.sandwich_name,
-            )
-            .order_by("total_ordered")  # least ordered first
+            .outerjoin(sales, sales.c.sandwich_id == sand_model.Sandwich.id)
+            .order_by(total.desc() if most_popular else total, sand_model.Sandwich.id)
             .limit(limit)
             .all()
         )
@@ -54,14 +90,106 @@ def get_least_popular_dishes(db: Session, limit: int = 5):
     ]
 
 
-def get_complaints(db: Session, max_stars: int = 2):
+def get_least_popular_dishes(
+    db: Session,
+    limit: int = 5,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    statuses: list[str] | None = None,
+):
+    """
+    Return dishes sorted by how rarely they are ordered.
+    Popularity is measured by total quantity ordered (OrderDetail.amount).
+    """
+    return _dishes_by_popularity(db, limit, False, start_date, end_date, statuses)
+
+
+def get_most_popular_dishes(
+    db: Session,
+    limit: int = 5,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    statuses: list[str] | None = None,
+):
+    """Return dishes sorted by how often they are ordered, best sellers first."""
+    return _dishes_by_popularity(db, limit, True, start_date, end_date, statuses)
+
+
+def get_capacity(db: Session):
+    """
+    How many of each sandwich can still be made from current stock,
+    scarcest first. Each figure assumes stock goes to that sandwich alone.
+    """
+    capacity = resource_controller.capacity(db)
+    names = dict(
+        db.query(sand_model.Sandwich.id, sand_model.Sandwich.sandwich_name)
+        .filter(sand_model.Sandwich.id.in_(capacity))
+        .all()
+    )
+    return sorted(
+        (
+            {"sandwich_id": sid, "sandwich_name": names.get(sid), "max_makeable": count}
+            for sid, count in capacity.items()
+            if sid in names
+        ),
+        key=lambda row: (row["max_makeable"], row["sandwich_id"]),
+    )
+
+
+# MySQL's default innodb_ft_min_token_size; shorter words are not in the
+# FULLTEXT index and are matched with LIKE instead
+FULLTEXT_MIN_TOKEN = 3
+MAX_SEARCH_TERMS = 8
+
+
+def _search_terms(text: str | None) -> list[str]:
+    # letters and digits only: "_" would be a LIKE wildcard
+    return re.findall(r"[^\W_]+", (text or "").lower())[:MAX_SEARCH_TERMS]
+
+
+def _reason_matches(db: Session, terms: list[str]):
+    """
+    Conditions requiring every term to appear in Rating.reason: one
+    FULLTEXT MATCH on MySQL (prefix match per word), LIKE '%term%' elsewhere.
+    """
+    reason = rating_model.Rating.reason
+
+    def like(term):
+        # terms are letters and digits only, so there is nothing to escape
+        return reason.like(f"%{term}%")
+
+    if db.get_bind().dialect.name != "mysql":
+        return [like(term) for term in terms]
+
+    indexed = [term for term in terms if len(term) >= FULLTEXT_MIN_TOKEN]
+    conditions = [like(term) for term in terms if len(term) < FULLTEXT_MIN_TOKEN]
+    if indexed:
+        boolean_query = " ".join(f"+{term}*" for term in indexed)
+        conditions.append(mysql_match(reason, against=boolean_query).in_boolean_mode())
+    return conditions
+
+
+def get_complaints(
+    db: Session,
+    max_stars: int = 2,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    sandwich_id: int | None = None,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    search: str | None = None,
+):
     """
-    Return low-star reviews (<= max_stars) with reasons.
+    Return one page of low-star reviews (<= max_stars) with reasons,
+    plus the cursor for the next page.
     Helps staff understand why customers are dissatisfied.
+
+    Optionally narrowed to one sandwich, a created_at range (end exclusive)
+    and reviews whose reason contains every word of `search`.
     """
     try:
         # explicit join to get sandwich name; does not rely on relationship
-        rows = (
+        q = (
             db.query(
                 rating_model.Rating.id.label("rating_id"),
                 rating_model.Rating.sandwich_id.label("sandwich_id"),
@@ -75,15 +203,32 @@ def get_complaints(db: Session, max_stars: int = 2):
                 rating_model.Rating.sandwich_id == sand_model.Sandwich.id,
             )
             .filter(rating_model.Rating.stars <= max_stars)
-            .all()
         )
+        if sandwich_id is not None:
+            q = q.filter(rating_model.Rating.sandwich_id == sandwich_id)
+        if start_date is not None:
+            q = q.filter(rating_model.Rating.created_at >= start_date)
+        if end_date is not None:
+            q = q.filter(rating_model.Rating.created_at < end_date)
+        terms = _search_terms(search)
+        if terms:
+            q = q.filter(*_reason_matches(db, terms))
+        rows, next_cursor = keyset_page(
+            q,
+            [rating_model.Rating.id],
+            limit,
+            cursor,
+            key_of=lambda row: [row.rating_id],
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
 
-    return [
+    complaints = [
         {
             "rating_id": row.rating_id,
             "sandwich_id": row.sandwich_id,
@@ -94,38 +239,340 @@ def get_complaints(db: Session, max_stars: int = 2):
         }
         for row in rows
     ]
+    return complaints, next_cursor
 
 
 def get_daily_revenue(db: Session, target_date: date):
     """
     Compute total revenue (sum of order.total) for a given calendar date.
     Only counts orders with payment_status = 'paid'.
+    Reads the daily_revenue rollup, so the cost does not depend on how
+    many orders exist.
     """
-
-    # Start of the day: YYYY-MM-DD 00:00:00
-    start_dt = datetime.combine(target_date, time.min)
-    # Start of next day: for half-open [start, next_start) interval
-    next_day = target_date + timedelta(days=1)
-    end_dt = datetime.combine(next_day, time.min)
-
     try:
-        revenue = (
-            db.query(func.coalesce(func.sum(order_model.Order.total), 0))
-            .filter(order_model.Order.payment_status == order_model.PaymentStatus.paid)
-            .filter(order_model.Order.order_date >= start_dt)
-            .filter(order_model.Order.order_date < end_dt)
-            .scalar()
-        )
+        row = db.get(revenue_model.DailyRevenue, target_date)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
 
-    if revenue is None:
-        revenue = Decimal("0.00")
+    revenue = row.total_revenue if row else Decimal("0.00")
 
     return {
         "date": target_date.isoformat(),
         "total_revenue": float(revenue),
-    }
\ No newline at end of file
+        "order_count": row.order_count if row else 0,
+    }
+
+
+REVENUE_BUCKETS = ("hour", "day", "week", "month")
+MAX_REVENUE_POINTS = 2000
+
+
+def _bucket_start(moment: datetime, bucket: str) -> datetime:
+    """Start of the hour/day/week (Monday)/month containing `moment`."""
+    if bucket == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    day = datetime.combine(moment.date(), time.min)
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start: datetime, bucket: str) -> datetime:
+    if bucket == "hour":
+        return start + timedelta(hours=1)
+    if bucket == "week":
+        return start + timedelta(weeks=1)
+    if bucket == "month":
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def _paid_revenue_by_hour(db: Session, start: datetime, end: datetime):
+    """(hour start, revenue, count) for paid orders in [start, end), one grouped query."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        hour = func.date_format(order_model.Order.order_date, "%Y-%m-%d %H:00:00")
+    else:
+        hour = func.strftime("%Y-%m-%d %H:00:00", order_model.Order.order_date)
+    rows = (
+        db.query(hour, func.sum(order_model.Order.total), func.count(order_model.Order.id))
+        .filter(
+            order_model.Order.payment_status == order_model.PaymentStatus.paid,
+            order_model.Order.order_date >= start,
+            order_model.Order.order_date < end,
+        )
+        .group_by(hour)
+        .all()
+    )
+    return [(datetime.fromisoformat(str(h)), revenue, count) for h, revenue, count in rows]
+
+
+def get_revenue_series(db: Session, start_date: date, end_date: date, bucket: str = "day"):
+    """
+    Paid revenue, order count and average ticket from start_date to
+    end_date (both inclusive), one point per hour, day, week (starting
+    Monday) or month. Buckets without sales are filled with zeros.
+
+    Day and coarser buckets read the daily_revenue rollup; hourly buckets
+    group paid orders by hour. Either way it is a single query.
+    """
+    if bucket not in REVENUE_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"bucket must be one of: {', '.join(REVENUE_BUCKETS)}.",
+        )
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must not be before start_date.",
+        )
+
+    start = datetime.combine(start_date, time.min)
+    end = datetime.combine(end_date + timedelta(days=1), time.min)
+    span = {"hour": 24 * ((end - start).days), "day": (end - start).days}.get(bucket, 0)
+    if span > MAX_REVENUE_POINTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range too large for {bucket} buckets (max {MAX_REVENUE_POINTS} points).",
+        )
+
+    try:
+        if bucket == "hour":
+            rows = _paid_revenue_by_hour(db, start, end)
+        else:
+            rollup = revenue_model.DailyRevenue
+            rows = [
+                (datetime.combine(day, time.min), revenue, count)
+                for day, revenue, count in db.query(rollup.day, rollup.total_revenue, rollup.order_count)
+                .filter(rollup.day >= start_date, rollup.day <= end_date)
+                .all()
+            ]
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    totals: dict[datetime, list] = {}
+    for moment, revenue, count in rows:
+        point = totals.setdefault(_bucket_start(moment, bucket), [Decimal("0.00"), 0])
+        point[0] += Decimal(revenue or 0)
+        point[1] += count
+
+    series = []
+    current = _bucket_start(start, bucket)
+    while current < end:
+        revenue, count = totals.get(current, (Decimal("0.00"), 0))
+        series.append({
+            "start": current.isoformat(),
+            "total_revenue": float(revenue),
+            "order_count": count,
+            "average_ticket": float((revenue / count).quantize(Decimal("0.01"))) if count else None,
+        })
+        current = _next_bucket(current, bucket)
+
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "bucket": bucket,
+        "series": series,
+    }
+
+
+def _revenue_contribution(order):
+    """(day, revenue, count) an order adds to the rollup; None if not paid."""
+    if order is None or order.payment_status != order_model.PaymentStatus.paid:
+        return None
+    return order.order_date.date(), Decimal(order.total or 0), 1
+
+
+def apply_revenue_change(db: Session, before, after) -> None:
+    """
+    Keep daily_revenue in step with one order changing from `before` to
+    `after`. Each is anything with order_date, payment_status and total
+    (an Order, a row, or None when the order is created / deleted).
+    Does not commit; call inside the transaction that changes the order.
+    """
+    old = _revenue_contribution(before)
+    new = _revenue_contribution(after)
+    if old == new:
+        return
+
+    if old is not None:
+        day, revenue, count = old
+        increment(db, revenue_model.DailyRevenue, {"day": day},
+                  {"total_revenue": -revenue, "order_count": -count})
+    if new is not None:
+        day, revenue, count = new
+        increment(db, revenue_model.DailyRevenue, {"day": day},
+                  {"total_revenue": revenue, "order_count": count})
+
+
+def rebuild_daily_revenue(db: Session) -> int:
+    """
+    Backfill daily_revenue from orders with one grouped INSERT ... SELECT.
+    Replaces whatever is there; returns the number of days written.
+    """
+    day = func.date(order_model.Order.order_date)
+    paid_by_day = (
+        select(
+            day,
+            func.coalesce(func.sum(order_model.Order.total), 0),
+            func.count(order_model.Order.id),
+        )
+        .where(order_model.Order.payment_status == order_model.PaymentStatus.paid)
+        .group_by(day)
+    )
+
+    table = revenue_model.DailyRevenue.__table__
+    db.execute(delete(table))
+    db.execute(
+        insert(table).from_select(["day", "total_revenue", "order_count"], paid_by_day)
+    )
+    db.commit()
+    return db.query(func.count()).select_from(table).scalar()
+
+
+def rating_summary(stats) -> dict:
+    """Count, average and star histogram from a SandwichRatingStats row (or None)."""
+    if stats is None or not stats.rating_count:
+        return {"count": 0, "average": None, "histogram": {stars: 0 for stars in range(1, 6)}}
+    return {"count": stats.rating_count, "average": stats.average, "histogram": stats.histogram}
+
+
+def get_rating_summaries(db: Session, sandwich_id: int | None = None):
+    """
+    Per-sandwich rating aggregates, lowest average first, read from the
+    sandwich_rating_stats rollup in one query. Sandwiches without ratings
+    are left out.
+    """
+    q = (
+        db.query(rating_stats_model.SandwichRatingStats, sand_model.Sandwich.sandwich_name)
+        .join(sand_model.Sandwich, sand_model.Sandwich.id == rating_stats_model.SandwichRatingStats.sandwich_id)
+        .filter(rating_stats_model.SandwichRatingStats.rating_count > 0)
+    )
+    if sandwich_id is not None:
+        q = q.filter(rating_stats_model.SandwichRatingStats.sandwich_id == sandwich_id)
+    rows = [
+        {"sandwich_id": stats.sandwich_id, "sandwich_name": name, **rating_summary(stats)}
+        for stats, name in q.all()
+    ]
+    return sorted(rows, key=lambda row: (row["average"], -row["count"], row["sandwich_id"]))
+
+
+def _rating_deltas(stars: int, sign: int) -> dict:
+    return {"rating_count": sign, "star_sum": sign * stars, f"stars_{stars}": sign}
+
+
+def apply_rating_change(db: Session, before, after) -> None:
+    """
+    Keep sandwich_rating_stats in step with one rating changing from
+    `before` to `after`, each anything with sandwich_id and stars (or None
+    on create / delete). At most two single-row upserts, however many
+    ratings exist. Does not commit.
+    """
+    old = (before.sandwich_id, before.stars) if before is not None else None
+    new = (after.sandwich_id, after.stars) if after is not None else None
+    if old == new:
+        return
+
+    if old is not None:
+        increment(db, rating_stats_model.SandwichRatingStats, {"sandwich_id": old[0]}, _rating_deltas(old[1], -1))
+    if new is not None:
+        increment(db, rating_stats_model.SandwichRatingStats, {"sandwich_id": new[0]}, _rating_deltas(new[1], 1))
+
+
+def rebuild_rating_stats(db: Session) -> int:
+    """
+    Backfill sandwich_rating_stats from ratings with one grouped
+    INSERT ... SELECT. Returns the number of sandwiches written.
+    """
+    stars = rating_model.Rating.stars
+    per_sandwich = (
+        select(
+            rating_model.Rating.sandwich_id,
+            func.count(rating_model.Rating.id),
+            func.coalesce(func.sum(stars), 0),
+            *(func.sum(case((stars == n, 1), else_=0)) for n in range(1, 6)),
+        )
+        .where(rating_model.Rating.sandwich_id.is_not(None))
+        .group_by(rating_model.Rating.sandwich_id)
+    )
+
+    table = rating_stats_model.SandwichRatingStats.__table__
+    db.execute(delete(table))
+    db.execute(
+        insert(table).from_select(
+            ["sandwich_id", "rating_count", "star_sum", "stars_1", "stars_2", "stars_3", "stars_4", "stars_5"],
+            per_sandwich,
+        )
+    )
+    db.commit()
+    return db.query(func.count()).select_from(table).scalar()
+
+
+def apply_sales_change(db: Session, changes) -> None:
+    """
+    Keep sandwich_daily_sales in step with order lines. `changes` holds
+    (order, sandwich_id, quantity delta) triples, where order is anything
+    with order_date and status (None is skipped). Deltas that land on the
+    same row are summed, and the whole batch is one multi-row upsert.
+    Does not commit. Callers that move lines between statuses must hold
+    the order row lock, or concurrent moves double-count.
+    """
+    totals: dict[tuple, int] = {}
+    for order, sandwich_id, quantity in changes:
+        if order is None or not quantity:
+            continue
+        key = (order.order_date.date(), sandwich_id, order.status)
+        totals[key] = totals.get(key, 0) + quantity
+
+    increment_many(
+        db,
+        daily_sales_model.SandwichDailySales,
+        ["day", "sandwich_id", "status"],
+        [
+            {"day": day, "sandwich_id": sandwich_id, "status": order_status, "quantity": quantity}
+            for (day, sandwich_id, order_status), quantity in totals.items()
+        ],
+    )
+
+
+def order_lines_by_sandwich(db: Session, order_id: int) -> list[tuple[int, int]]:
+    """(sandwich_id, total amount) for one order's lines, in one grouped query."""
+    return (
+        db.query(od_model.OrderDetail.sandwich_id, func.sum(od_model.OrderDetail.amount))
+        .filter(od_model.OrderDetail.order_id == order_id)
+        .group_by(od_model.OrderDetail.sandwich_id)
+        .all()
+    )
+
+
+def rebuild_sandwich_daily_sales(db: Session) -> int:
+    """
+    Backfill sandwich_daily_sales from orders and order_details with one
+    grouped INSERT ... SELECT. Returns the number of rows written.
+    """
+    day = func.date(order_model.Order.order_date)
+    per_day = (
+        select(
+            day,
+            od_model.OrderDetail.sandwich_id,
+            order_model.Order.status,
+            func.sum(od_model.OrderDetail.amount),
+        )
+        .join(order_model.Order, order_model.Order.id == od_model.OrderDetail.order_id)
+        .where(od_model.OrderDetail.sandwich_id.is_not(None))
+        .group_by(day, od_model.OrderDetail.sandwich_id, order_model.Order.status)
+    )
+
+    table = daily_sales_model.SandwichDailySales.__table__
+    db.execute(delete(table))
+    db.execute(insert(table).from_select(["day", "sandwich_id", "status", "quantity"], per_day))
+    db.commit()
+    return db.query(func.count()).select_from(table).scalar()
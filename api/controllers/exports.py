@@ -0,0 +1,231 @@
+"""
+Columnar (Arrow IPC / Parquet) exports of the order data for analytics.
+
+Each table is read through a server-side cursor and written one record
+batch at a time, so memory stays bounded by `batch_size` rows however
+large the range is. pyarrow is optional: it is imported only when an
+export runs, and a missing install is reported as HTTP 501.
+"""
+import os
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.types import Boolean, Date, DateTime, Enum, Integer, Numeric, String
+
+from ..dependencies.database import engine
+from ..models import order_details as od_model
+from ..models import orders as order_model
+from ..models import ratings as rating_model
+from ..models import sandwiches as sand_model
+
+FORMATS = {
+    "arrow": ("arrow", "application/vnd.apache.arrow.stream"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+DEFAULT_BATCH_SIZE = 10_000
+
+
+def _date_filters(column, start_date, end_date) -> list:
+    filters = []
+    if start_date is not None:
+        filters.append(column >= start_date)
+    if end_date is not None:
+        filters.append(column <= end_date)
+    return filters
+
+
+def _orders(start_date, end_date):
+    table = order_model.Order.__table__
+    return (
+        select(table)
+        .where(*_date_filters(table.c.order_date, start_date, end_date))
+        .order_by(table.c.order_date, table.c.id)
+    )
+
+
+def _order_details(start_date, end_date):
+    # lines of the orders placed in the range
+    table = od_model.OrderDetail.__table__
+    orders = order_model.Order.__table__
+    return (
+        select(table)
+        .join(orders, orders.c.id == table.c.order_id)
+        .where(*_date_filters(orders.c.order_date, start_date, end_date))
+        .order_by(table.c.id)
+    )
+
+
+def _ratings(start_date, end_date):
+    table = rating_model.Rating.__table__
+    return (
+        select(table)
+        .where(*_date_filters(table.c.created_at, start_date, end_date))
+        .order_by(table.c.id)
+    )
+
+
+def _sandwiches(start_date, end_date):
+    # the menu is a dimension table: exported whole, whatever the range
+    table = sand_model.Sandwich.__table__
+    return select(table).order_by(table.c.id)
+
+
+TABLES = {
+    "orders": _orders,
+    "order_details": _order_details,
+    "ratings": _ratings,
+    "sandwiches": _sandwiches,
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Columnar export needs pyarrow; install it with `pip install pyarrow`.",
+        )
+    return pyarrow
+
+
+def _arrow_type(pa, column):
+    sql_type = column.type
+    if isinstance(sql_type, Enum):
+        return pa.string()
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Numeric):
+        if sql_type.scale is not None:
+            return pa.decimal128(sql_type.precision, sql_type.scale)
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    if isinstance(sql_type, String):
+        return pa.string()
+    raise TypeError(f"No Arrow type for {column.name} ({sql_type!r})")
+
+
+def arrow_schema(pa, stmt):
+    return pa.schema(
+        [pa.field(c.name, _arrow_type(pa, c), nullable=c.nullable) for c in stmt.selected_columns]
+    )
+
+
+class _Chunks:
+    """Write-only file object that hands back what has been written since the last drain."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def record_batches(pa, stmt, schema, bind=None, batch_size: int = DEFAULT_BATCH_SIZE):
+    """Yield `stmt`'s rows as Arrow record batches of up to `batch_size` rows."""
+    enum_columns = [i for i, c in enumerate(stmt.selected_columns) if isinstance(c.type, Enum)]
+    with (bind or engine).connect() as conn:
+        result = conn.execution_options(stream_results=True, max_row_buffer=batch_size).execute(stmt)
+        for rows in result.partitions(batch_size):
+            columns = [list(values) for values in zip(*rows)]
+            for i in enum_columns:
+                columns[i] = [v.value if v is not None else None for v in columns[i]]
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            )
+
+
+def export_table(
+    table: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    fmt: str = "parquet",
+    bind=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+):
+    """
+    Return an iterator of bytes: `table` as a zstd-compressed Arrow IPC
+    stream or Parquet file (one row group per batch). Checks the arguments and
+    pyarrow up front, so errors are raised before streaming starts.
+    Uses its own connection, as the response is streamed after the
+    request's session has been closed.
+    """
+    if table not in TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown table; use one of: {', '.join(TABLES)}.",
+        )
+    if fmt not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown format; use one of: {', '.join(FORMATS)}.",
+        )
+    pa = _pyarrow()
+    stmt = TABLES[table](start_date, end_date)
+    schema = arrow_schema(pa, stmt)
+
+    def stream():
+        sink = _Chunks()
+        if fmt == "parquet":
+            writer = pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_stream(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+        with writer:
+            for batch in record_batches(pa, stmt, schema, bind, batch_size):
+                if fmt == "parquet":
+                    writer.write_batch(batch, row_group_size=batch_size)
+                else:
+                    writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
+
+    return stream()
+
+
+def write_files(
+    directory,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    fmt: str = "parquet",
+    tables=None,
+    bind=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, str]:
+    """Export each table to `<directory>/<table>.<ext>`; returns {table: path}."""
+    os.makedirs(directory, exist_ok=True)
+    written = {}
+    for table in tables or TABLES:
+        path = os.path.join(directory, f"{table}.{FORMATS[fmt][0]}")
+        with open(path, "wb") as f:
+            for chunk in export_table(table, start_date, end_date, fmt, bind, batch_size):
+                f.write(chunk)
+        written[table] = path
+    return written
@@ -1,91 +1,67 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Float, type_coerce
+from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException, status, Response
 from sqlalchemy.exc import SQLAlchemyError
-from ..controllers.orders import recalculate_order_totals
+from ..controllers.orders import apply_line_delta, tracking_cache
+from ..controllers.analytics import apply_sales_change
 from typing import Optional
+from decimal import Decimal
 
+from ..controllers import resources as resource_controller
+from ..dependencies import metrics
+from ..dependencies.pagination import DEFAULT_PAGE_SIZE, keyset_page
 from ..models import order_details as model
-from ..models import recipes as recipe_model
-from ..models import resources as resource_model
+from ..models import sandwiches as sand_model
+from ..models.tags import SandwichTag
 
-def create(db: Session, request):
-    """
-    Create an OrderDetail only if there are enough ingredients
-    in inventory (Resources) according to the Recipes.
 
-    If any required ingredient is insufficient, raise HTTP 400
-    with a clear message.
-    """
-    # 1) Find recipe rows for this sandwich
-    recipes = (
-        db.query(recipe_model.Recipe)
-        .filter(recipe_model.Recipe.sandwich_id == request.sandwich_id)
-        .all()
+def _line_value(db: Session, sandwich_id: int, amount: int) -> Decimal:
+    """amount * current sandwich price, i.e. what the line adds to a subtotal."""
+    price = (
+        db.query(sand_model.Sandwich.price)
+        .filter(sand_model.Sandwich.id == sandwich_id)
+        .scalar()
     )
-
-    if not recipes:
+    if price is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No recipe defined for this sandwich; cannot check ingredients.",
+            detail="Invalid sandwich ID.",
         )
+    return Decimal(price) * amount
 
-    # 2) Check inventory for each ingredient
-    insufficient = []
-    for recipe in recipes:
-        resource = (
-            db.query(resource_model.Resource)
-            .filter(resource_model.Resource.id == recipe.resource_id)
-            .first()
-        )
+def _tracking_numbers(*orders) -> set[str]:
+    # read before commit expires the orders
+    return {order.tracking_number for order in orders if order is not None}
 
-        if not resource:
-            insufficient.append(
-                {
-                    "resource_id": recipe.resource_id,
-                    "message": "Recipe references a missing resource.",
-                }
-            )
-            continue
-
-        required_amount = recipe.amount * request.amount
-        if resource.amount < required_amount:
-            insufficient.append(
-                {
-                    "resource_name": resource.item,
-                    "required": required_amount,
-                    "available": resource.amount,
-                }
-            )
+def _invalidate_tracking(tracking_numbers: set[str]) -> None:
+    # only after commit, so a concurrent read cannot re-cache the old totals
+    for tracking_number in tracking_numbers:
+        tracking_cache.invalidate(tracking_number)
 
-    # 3) If anything is insufficient, abort with a clear error message
-    if insufficient:
-        parts = []
-        for item in insufficient:
-            if "resource_name" in item:
-                parts.append(
-                    f"{item['resource_name']}: required {item['required']}, available {item['available']}"
-                )
-            else:
-                parts.append(item["message"])
-        message = "Insufficient ingredients: " + "; ".join(parts)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=message,
-        )
+def create(db: Session, request):
+    """
+    Create an OrderDetail only if there are enough ingredients
+    in inventory (Resources) according to the Recipes.
 
-    # 4) Otherwise, decrement inventory and create the order detail
-    try:
-        # Decrement resources
-        for recipe in recipes:
-            resource = (
-                db.query(resource_model.Resource)
-                .filter(resource_model.Resource.id == recipe.resource_id)
-                .first()
-            )
-            required_amount = recipe.amount * request.amount
-            resource.amount -= required_amount
+    Stock is checked and decremented in one guarded UPDATE, so concurrent
+    orders cannot oversell. If any required ingredient is insufficient,
+    raise HTTP 400 with a clear message.
+    """
+    # 1) Work out what this line costs and how much of each resource it needs
+    line_value = _line_value(db, request.sandwich_id, request.amount)
+    required = resource_controller.required_ingredients(
+        db, [(request.sandwich_id, request.amount)]
+    )
 
-        # Create order detail row
+    try:
+        # 2) Reserve inventory (check + decrement in one statement)
+        try:
+            resource_controller.reserve(db, required)
+        except HTTPException:
+            metrics.INVENTORY_REJECTIONS.labels("order_details").inc()
+            raise
+
+        # 3) Create order detail row in the same transaction
         new_item = model.OrderDetail(
             order_id=request.order_id,
             sandwich_id=request.sandwich_id,
@@ -93,9 +69,12 @@ def create(db: Session, request):
         )
 
         db.add(new_item)
+        order = apply_line_delta(db, request.order_id, line_value)
+        apply_sales_change(db, [(order, request.sandwich_id, request.amount)])
+        tracking_numbers = _tracking_numbers(order)
         db.commit()
+        _invalidate_tracking(tracking_numbers)
         db.refresh(new_item)
-        recalculate_order_totals(db, request.order_id)
 
         return new_item
 
@@ -107,17 +86,69 @@ def create(db: Session, request):
             detail=error,
         )
 
-def read(db: Session, order_id: int | None = None):
-    q = db.query(model.OrderDetail)
+# OrderDetail embeds its sandwich (with tag_ids); load both for the whole
+# result in two extra queries instead of two per detail.
+_WITH_SANDWICH = selectinload(model.OrderDetail.sandwich).selectinload(sand_model.Sandwich.sandwich_tags)
+
+_SANDWICH_COLUMNS = [
+    sand_model.Sandwich.sandwich_name,
+    type_coerce(sand_model.Sandwich.price, Float).label("price"),
+    sand_model.Sandwich.id.label("sandwich_id"),
+]
+
+def read(
+    db: Session,
+    order_id: int | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+):
+    """
+    One page of order details as plain dicts shaped like
+    schemas.order_details.OrderDetail: the lines joined to their sandwich
+    in one query, plus one query for those sandwiches' tag ids.
+    """
+    q = (
+        db.query(model.OrderDetail.amount, model.OrderDetail.id, model.OrderDetail.order_id, *_SANDWICH_COLUMNS)
+        .outerjoin(sand_model.Sandwich, sand_model.Sandwich.id == model.OrderDetail.sandwich_id)
+    )
 
     if order_id is not None:
         q = q.filter(model.OrderDetail.order_id == order_id)
 
-    return q.all()
+    rows, next_cursor = keyset_page(q, [model.OrderDetail.id], limit, cursor)
+
+    tag_ids: dict[int, list[int]] = {}
+    sandwich_ids = {row.sandwich_id for row in rows if row.sandwich_id is not None}
+    if sandwich_ids:
+        for sandwich_id, tag_id in (
+            db.query(SandwichTag.sandwich_id, SandwichTag.tag_id)
+            .filter(SandwichTag.sandwich_id.in_(sandwich_ids))
+            .order_by(SandwichTag.sandwich_id, SandwichTag.tag_id)
+        ):
+            tag_ids.setdefault(sandwich_id, []).append(tag_id)
+
+    items = [
+        {
+            "amount": row.amount,
+            "id": row.id,
+            "order_id": row.order_id,
+            "sandwich": {
+                "sandwich_name": row.sandwich_name,
+                "price": row.price,
+                "tag_ids": tag_ids.get(row.sandwich_id, []),
+                "id": row.sandwich_id,
+                "max_makeable": None,
+                "rating": None,
+            } if row.sandwich_id is not None else None,
+        }
+        for row in rows
+    ]
+    return items, next_cursor
 
 def read_one(db: Session, item_id: int):
     item = (
         db.query(model.OrderDetail)
+        .options(_WITH_SANDWICH)
         .filter(model.OrderDetail.id == item_id)
         .first()
     )
@@ -130,17 +161,35 @@ def read_one(db: Session, item_id: int):
 
 def update(db: Session, request, item_id: int):
     q = db.query(model.OrderDetail).filter(model.OrderDetail.id == item_id)
-    if not q.first():
+    old = q.first()
+    if not old:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Id not found!",
         )
+    data = request.dict(exclude_unset=True)
+    old_order_id, old_value = old.order_id, _line_value(db, old.sandwich_id, old.amount)
+    old_sandwich_id, old_amount = old.sandwich_id, old.amount
+    new_order_id = data.get("order_id", old.order_id)
+    new_sandwich_id = data.get("sandwich_id", old.sandwich_id)
+    new_amount = data.get("amount", old.amount)
+    new_value = _line_value(db, new_sandwich_id, new_amount)
     try:
-        q.update(request.dict(exclude_unset=True), synchronize_session=False)
+        q.update(data, synchronize_session=False)
+        if new_order_id == old_order_id:
+            old_order = new_order = apply_line_delta(db, old_order_id, new_value - old_value)
+        else:
+            # line moved between orders
+            old_order = apply_line_delta(db, old_order_id, -old_value)
+            new_order = apply_line_delta(db, new_order_id, new_value)
+        apply_sales_change(db, [
+            (old_order, old_sandwich_id, -old_amount),
+            (new_order, new_sandwich_id, new_amount),
+        ])
+        tracking_numbers = _tracking_numbers(old_order, new_order)
         db.commit()
-        updated = q.first()
-        recalculate_order_totals(db, updated.order_id)
-        return updated
+        _invalidate_tracking(tracking_numbers)
+        return q.first()
     except SQLAlchemyError as e:
         db.rollback()
         error = str(e.__dict__.get("orig", e))
@@ -152,15 +201,20 @@ def update(db: Session, request, item_id: int):
 def delete(db: Session, item_id: int):
     try:
         q = db.query(model.OrderDetail).filter(model.OrderDetail.id == item_id)
-        if not q.first():
+        item = q.first()
+        if not item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Id not found!",
             )
-        order_id = q.first().order_id
+        order_id = item.order_id
+        line_value = _line_value(db, item.sandwich_id, item.amount)
         q.delete(synchronize_session=False)
+        order = apply_line_delta(db, order_id, -line_value)
+        apply_sales_change(db, [(order, item.sandwich_id, -item.amount)])
+        tracking_numbers = _tracking_numbers(order)
         db.commit()
-        recalculate_order_totals(db, order_id)
+        _invalidate_tracking(tracking_numbers)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     except SQLAlchemyError as e:
         db.rollback()
@@ -168,4 +222,4 @@ def delete(db: Session, item_id: int):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=error,
-        )
\ No newline at end of file
+        )
@@ -1,69 +1,177 @@
+import asyncio
+import csv
+import enum
+import io
+from contextlib import AsyncExitStack
+
 from fastapi import HTTPException, status, Response, Depends
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, insert, select
 from datetime import datetime
 from typing import Optional
 from ..models import promotions as promo_model
 from ..models import orders as order_model
 from ..models import order_details as od_model
 from ..models import sandwiches as sand_model
-from decimal import Decimal
+from ..schemas import orders as order_schema
+from ..controllers import analytics as analytics_controller
+from ..controllers import promotions as promo_controller
+from ..controllers import resources as resource_controller
+from ..dependencies import metrics
+from ..dependencies.cache import LRUCache
+from ..dependencies.config import conf
+from ..dependencies.etag import etag_for
+from ..dependencies.events import get_broker, sse
+from ..dependencies.database import engine
+from ..dependencies.pagination import DEFAULT_PAGE_SIZE, keyset_page
+from ..dependencies.serialization import dumps, row_dicts, schema_columns
+from decimal import Decimal, ROUND_HALF_UP
+from types import SimpleNamespace
 
+TAX_RATE = Decimal("0.075")
+CENT = Decimal("0.01")
 
-def recalculate_order_totals(db: Session, order_id: int):
-    """
-    Recalculate subtotal, discount, tax, and total for a given order.
-    Called after creating/updating/deleting order details.
+# tracking_number -> (serialized order, ETag) for the customer tracking page.
+# Dropped on every write to that order; the TTL bounds staleness across workers.
+tracking_cache = LRUCache("tracking", maxsize=4096, ttl=conf.tracking_cache_ttl)
+
+# status event streams end after one of these; heartbeats keep idle proxies open
+FINAL_STATUSES = {order_model.OrderStatus.completed.value, order_model.OrderStatus.canceled.value}
+EVENTS_HEARTBEAT_SECONDS = 15
+
+
+def apply_line_delta(db: Session, order_id: int, delta: Decimal):
     """
+    Adjust an order's totals by the value of one changed line
+    (+amount * price on create, -amount * price on delete, new - old
+    on update) instead of re-aggregating every line. Drift from a full
+    recompute is found and fixed by verify_all_order_totals.
 
-    # 1. Get the order
+    The order row is locked for the rest of the transaction so concurrent
+    edits to the same order cannot lose an update. Returns the locked
+    order, or None if it does not exist. Does not commit; the caller drops
+    the order's tracking_cache entry once it has.
+    """
     order = (
         db.query(order_model.Order)
         .filter(order_model.Order.id == order_id)
+        .with_for_update()
         .first()
     )
     if not order:
-        return  # or raise exception if you prefer
-
-    # 2. Calculate subtotal: SUM(amount * sandwich.price)
-    subtotal = (
-        db.query(func.sum(od_model.OrderDetail.amount * sand_model.Sandwich.price))
-        .join(sand_model.Sandwich, sand_model.Sandwich.id == od_model.OrderDetail.sandwich_id)
-        .filter(od_model.OrderDetail.order_id == order_id)
-        .scalar()
+        return None
+
+    promo = None
+    if order.promo_id:
+        promo = promo_controller.promotion_index(db).get(order.promo_id)
+    before = _revenue_snapshot(order)
+    _apply_totals(order, Decimal(order.subtotal or 0) + delta, promo)
+    analytics_controller.apply_revenue_change(db, before, order)
+    return order
+
+def _revenue_snapshot(order):
+    """Copy of the fields the daily revenue and sales rollups depend on."""
+    return SimpleNamespace(
+        order_date=order.order_date,
+        status=order.status,
+        payment_status=order.payment_status,
+        total=order.total,
     )
 
-    if subtotal is None:
-        subtotal = Decimal("0.00")
+def verify_all_order_totals(db: Session, batch_size: int = 500, repair: bool = False):
+    """
+    Recompute totals for every order in batches of `batch_size` and compare
+    them with the stored values, which can drift from the incremental path
+    (e.g. after a sandwich price change). With repair=True, mismatching
+    orders are rewritten, each batch is committed and their cached
+    tracking responses are dropped.
+    """
+    checked = 0
+    mismatched_ids = []
+    last_id = 0
 
-    subtotal = Decimal(subtotal)
+    while True:
+        orders = (
+            db.query(order_model.Order)
+            .filter(order_model.Order.id > last_id)
+            .order_by(order_model.Order.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not orders:
+            break
+        ids = [o.id for o in orders]
+
+        # one grouped query per batch instead of one per order
+        subtotals = dict(
+            db.query(
+                od_model.OrderDetail.order_id,
+                func.sum(od_model.OrderDetail.amount * sand_model.Sandwich.price),
+            )
+            .join(sand_model.Sandwich, sand_model.Sandwich.id == od_model.OrderDetail.sandwich_id)
+            .filter(od_model.OrderDetail.order_id.in_(ids))
+            .group_by(od_model.OrderDetail.order_id)
+            .all()
+        )
+        promo_ids = {o.promo_id for o in orders if o.promo_id}
+        promos = {
+            p.id: p
+            for p in db.query(promo_model.Promotion).filter(promo_model.Promotion.id.in_(promo_ids)).all()
+        } if promo_ids else {}
 
-    # 3. Apply promotion if present
+        repaired = []
+        for order in orders:
+            expected = SimpleNamespace()
+            _apply_totals(expected, Decimal(subtotals.get(order.id) or 0), promos.get(order.promo_id))
+            if any(
+                Decimal(getattr(order, f) or 0).quantize(CENT, ROUND_HALF_UP)
+                != Decimal(getattr(expected, f)).quantize(CENT, ROUND_HALF_UP)
+                for f in ("subtotal", "discount", "tax", "total")
+            ):
+                mismatched_ids.append(order.id)
+                if repair:
+                    before = _revenue_snapshot(order)
+                    _apply_totals(order, Decimal(expected.subtotal), promos.get(order.promo_id))
+                    analytics_controller.apply_revenue_change(db, before, order)
+                    repaired.append(order.tracking_number)
+
+        if repair:
+            db.commit()
+            for tracking_number in repaired:
+                tracking_cache.invalidate(tracking_number)
+        checked += len(orders)
+        last_id = ids[-1]
+        db.expunge_all()
+
+    return {
+        "checked": checked,
+        "mismatched": len(mismatched_ids),
+        "repaired": len(mismatched_ids) if repair else 0,
+        "mismatched_ids": mismatched_ids[:100],
+    }
+
+def _apply_totals(order, subtotal: Decimal, promo) -> None:
+    """Set subtotal, discount, tax and total on `order` from its subtotal."""
     discount = Decimal("0.00")
-    if order.promo_id:
-        promo = db.query(promo_model.Promotion).filter(promo_model.Promotion.id == order.promo_id).first()
-        if promo and promo.is_active:
-            if promo.discount_type == "percent":
-                discount = subtotal * Decimal(promo.discount_value) / Decimal("100")
-            elif promo.discount_type == "amount":
-                discount = Decimal(promo.discount_value)
-
-    # 4. Tax (example: 7.5% → change if needed)
-    TAX_RATE = Decimal("0.075")
+    if promo and promo.is_active:
+        if promo.discount_type == "percent":
+            discount = subtotal * Decimal(promo.discount_value) / Decimal("100")
+        elif promo.discount_type == "amount":
+            discount = Decimal(promo.discount_value)
+
+    # Tax (example: 7.5% → change if needed)
     taxable_amount = subtotal - discount
     tax = taxable_amount * TAX_RATE if taxable_amount > 0 else Decimal("0.00")
 
-    # 5. Total
-    total = subtotal - discount + tax
-
-    # 6. Save back into the order
+    # round like the DECIMAL(10, 2) columns will, so in-memory values
+    # (and the rollups derived from them) match what is stored
+    subtotal, discount, tax = (v.quantize(CENT, ROUND_HALF_UP) for v in (subtotal, discount, tax))
     order.subtotal = subtotal
     order.discount = discount
     order.tax = tax
-    order.total = total
-
-    db.commit()
+    order.total = subtotal - discount + tax
 
 def read_by_tracking_number(db: Session, tracking_number: str):
     order = (
@@ -78,31 +186,110 @@ def read_by_tracking_number(db: Session, tracking_number: str):
         )
     return order
 
-def create(db: Session, request):
-    # --- Validate promotion if provided ---
-    promo = None
-    promo_id = getattr(request, "promo_id", None)
+async def read_by_tracking_number_async(db: AsyncSession, tracking_number: str):
+    result = await db.execute(
+        select(order_model.Order)
+        .where(order_model.Order.tracking_number == tracking_number)
+    )
+    order = result.scalars().first()
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order with this tracking number not found.",
+        )
+    return order
+
+async def track_async(db: AsyncSession, tracking_number: str) -> tuple[bytes, str]:
+    """
+    The order behind `tracking_number` as JSON plus its ETag. The ETag is a
+    hash of the body, so it changes whenever status, payment status or
+    totals do. Served from memory for up to conf.tracking_cache_ttl seconds.
+    """
+    cached = tracking_cache.get(tracking_number)
+    if cached is None:
+        generation = tracking_cache.generation
+        order = await read_by_tracking_number_async(db, tracking_number)
+        body = order_schema.Order.model_validate(order, from_attributes=True).model_dump_json().encode()
+        cached = (body, etag_for(body))
+        tracking_cache.set(tracking_number, cached, generation)
+    return cached
+
+async def status_events(db: AsyncSession, tracking_number: str, is_disconnected):
+    """
+    Server-Sent Events for one order: a `snapshot` of the order, then one
+    `status` event per transition published by update(), until the order
+    completes or is canceled or the client goes away.
+
+    Subscribes before reading the snapshot so no transition is missed, and
+    releases the DB session before streaming. Raises 404 up front.
+    """
+    stack = AsyncExitStack()
+    events = await stack.enter_async_context(get_broker().subscribe(tracking_number))
+    try:
+        order = await read_by_tracking_number_async(db, tracking_number)
+        snapshot = order_schema.Order.model_validate(order, from_attributes=True)
+    except BaseException:
+        await stack.aclose()
+        raise
+    await db.close()
+
+    async def stream():
+        async with stack:
+            yield sse(snapshot.model_dump_json(), event="snapshot")
+            if snapshot.status in FINAL_STATUSES:
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                yield sse(event, event="status")
+                if event["status"] in FINAL_STATUSES:
+                    return
+
+    return stream()
+
+def _publish_status_change(order, previous_status) -> None:
+    get_broker().publish(order.tracking_number, {
+        "tracking_number": order.tracking_number,
+        "status": order.status.value,
+        "previous_status": previous_status.value,
+        "payment_status": order.payment_status.value,
+        "at": datetime.utcnow().isoformat(),
+    })
+
+def _validate_promo(db: Session, promo_id: Optional[int]):
+    """
+    Return the usable promotion for `promo_id`, or raise HTTP 400.
+    Answered from the in-memory promotion index, without a query.
+    """
+    if promo_id is None:
+        return None
+
+    index = promo_controller.promotion_index(db)
+    if index.get(promo_id) is None:
+        metrics.PROMO_REJECTIONS.labels("invalid").inc()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid promotion ID.",
+        )
 
-    if promo_id is not None:
-        promo = (
-            db.query(promo_model.Promotion)
-            .filter(promo_model.Promotion.id == promo_id)
-            .first()
+    promo = index.active(promo_id)
+    if promo is None:
+        metrics.PROMO_REJECTIONS.labels("expired_or_inactive").inc()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Promotion is expired or inactive.",
         )
-        if not promo:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid promotion ID.",
-            )
+    return promo
 
-        now = datetime.utcnow()
-        if (not promo.is_active) or (
-            promo.expires_at is not None and promo.expires_at < now
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Promotion is expired or inactive.",
-            )
+def create(db: Session, request):
+    # --- Validate promotion if provided ---
+    promo_id = getattr(request, "promo_id", None)
+    _validate_promo(db, promo_id)
 
     new_item = order_model.Order(
         customer_name=request.customer_name,
@@ -120,28 +307,198 @@ def create(db: Session, request):
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
+    metrics.ORDERS_CREATED.labels("order").inc()
     return new_item
 
+def create_with_details(db: Session, request):
+    """
+    Create an order together with all of its line items in one transaction.
+
+    Inventory for the whole cart is reserved in one pass, the details are
+    inserted in bulk and totals are computed once from the line prices.
+    Nothing is written if any step fails.
+    """
+    if not request.details:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="An order needs at least one line item.",
+        )
+
+    promo_id = getattr(request, "promo_id", None)
+    promo = _validate_promo(db, promo_id)
+
+    lines = [(line.sandwich_id, line.amount) for line in request.details]
+    if any(amount <= 0 for _, amount in lines):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Line item amounts must be positive.",
+        )
+
+    prices = dict(
+        db.query(sand_model.Sandwich.id, sand_model.Sandwich.price)
+        .filter(sand_model.Sandwich.id.in_({sid for sid, _ in lines}))
+        .all()
+    )
+    unknown = sorted({sid for sid, _ in lines if sid not in prices})
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown sandwich id(s): {unknown}",
+        )
+
+    required = resource_controller.required_ingredients(db, lines)
+
+    try:
+        try:
+            resource_controller.reserve(db, required)
+        except HTTPException:
+            metrics.INVENTORY_REJECTIONS.labels("checkout").inc()
+            raise
+
+        new_item = order_model.Order(
+            customer_name=request.customer_name,
+            customer_phone=request.customer_phone,
+            delivery_address=request.delivery_address,
+            order_type=order_model.OrderType(request.order_type),
+            promo_id=promo_id,
+        )
+
+        subtotal = sum(
+            (Decimal(prices[sid]) * amount for sid, amount in lines),
+            Decimal("0.00"),
+        )
+        _apply_totals(new_item, subtotal, promo)
+
+        db.add(new_item)
+        db.flush()
+
+        # one executemany for all line items
+        db.execute(
+            insert(od_model.OrderDetail),
+            [
+                {"order_id": new_item.id, "sandwich_id": sid, "amount": amount}
+                for sid, amount in lines
+            ],
+        )
+        analytics_controller.apply_sales_change(
+            db, [(new_item, sid, amount) for sid, amount in lines]
+        )
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        error = str(e.__dict__.get("orig", e))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    metrics.ORDERS_CREATED.labels("checkout").inc()
+
+    # reload with the details, their sandwiches and tags in three queries
+    return (
+        db.query(order_model.Order)
+        .options(
+            selectinload(order_model.Order.order_details)
+            .selectinload(od_model.OrderDetail.sandwich)
+            .selectinload(sand_model.Sandwich.sandwich_tags)
+        )
+        .filter(order_model.Order.id == new_item.id)
+        .one()
+    )
+
 def read(
     db: Session,
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
 ):
     """
-    Return all orders, optionally filtered by order_date range.
+    Return one page of orders ordered by (order_date, id), optionally
+    filtered by order_date range, plus the cursor for the next page.
     If start_date/end_date are provided, we filter on:
         order_date >= start_date (if given)
         order_date <= end_date   (if given)
+
+    Orders come back as plain dicts shaped like schemas.orders.Order,
+    read as column rows without building ORM objects.
     """
-    q = db.query(order_model.Order)
+    q = db.query(*_ORDER_COLUMNS).filter(*_order_date_filters(start_date, end_date))
 
-    if start_date is not None:
-        q = q.filter(order_model.Order.order_date >= start_date)
+    rows, next_cursor = keyset_page(
+        q,
+        [order_model.Order.order_date, order_model.Order.id],
+        limit,
+        cursor,
+    )
+    return row_dicts(rows), next_cursor
 
+
+_ORDER_COLUMNS = schema_columns(order_model.Order.__table__, order_schema.Order)
+
+
+def _order_date_filters(start_date: Optional[datetime], end_date: Optional[datetime]) -> list:
+    filters = []
+    if start_date is not None:
+        filters.append(order_model.Order.order_date >= start_date)
     if end_date is not None:
-        q = q.filter(order_model.Order.order_date <= end_date)
+        filters.append(order_model.Order.order_date <= end_date)
+    return filters
+
+
+EXPORT_COLUMNS = [
+    "id", "tracking_number", "customer_name", "customer_phone", "delivery_address",
+    "order_type", "status", "order_date", "subtotal", "discount", "tax", "total",
+    "payment_status", "promo_id",
+]
+
+
+def _export_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def export(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    fmt: str = "ndjson",
+    chunk_size: int = 1000,
+    bind=None,
+):
+    """
+    Yield orders in the date range as NDJSON lines or CSV, one chunk of
+    rows at a time.
+
+    Rows are read through a server-side cursor as plain tuples (no ORM
+    objects), so memory stays flat however many orders match. Uses its
+    own connection from `bind` (the app engine by default) because the
+    response is streamed after the request's session has been closed.
+    """
+    columns = [order_model.Order.__table__.c[name] for name in EXPORT_COLUMNS]
+    stmt = (
+        select(*columns)
+        .where(*_order_date_filters(start_date, end_date))
+        .order_by(order_model.Order.order_date, order_model.Order.id)
+    )
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
 
-    return q.order_by(order_model.Order.order_date).all()
+    with (bind or engine).connect() as conn:
+        result = conn.execution_options(stream_results=True, max_row_buffer=chunk_size).execute(stmt)
+        for rows in result.partitions(chunk_size):
+            if fmt == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([[_export_value(v) for v in row] for row in rows])
+                yield buffer.getvalue()
+            else:
+                yield b"".join(dumps(row._asdict()) + b"\n" for row in rows)
 
 
 def read_one(db: Session, item_id):
@@ -155,18 +512,66 @@ def read_one(db: Session, item_id):
     return item
 
 
+async def read_one_async(db: AsyncSession, item_id):
+    try:
+        item = await db.get(order_model.Order, item_id)
+        if not item:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
+    except SQLAlchemyError as e:
+        error = str(e.__dict__['orig'])
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+    return item
+
+
 def update(db: Session, item_id, request):
+    """
+    Update an order and move it between rollup buckets: its total in
+    daily_revenue when the payment status changes, its lines in
+    sandwich_daily_sales when the status changes.
+
+    The rollups stay exact only because the order row is locked before the
+    "before" snapshot is taken. Without the lock, two concurrent status
+    changes would both move the lines out of the old bucket and into two
+    different new ones, and two payments would both count the order.
+    """
     try:
         item = db.query(order_model.Order).filter(order_model.Order.id == item_id)
-        if not item.first():
+        # locked until commit (see above)
+        current = item.with_for_update().first()
+        if not current:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
+        before = _revenue_snapshot(current)
+        previous_status = current.status
         update_data = request.dict(exclude_unset=True)
         item.update(update_data, synchronize_session=False)
+        after = (
+            db.query(
+                order_model.Order.order_date,
+                order_model.Order.status,
+                order_model.Order.payment_status,
+                order_model.Order.total,
+            )
+            .filter(order_model.Order.id == item_id)
+            .one()
+        )
+        analytics_controller.apply_revenue_change(db, before, after)
+        if after.status != previous_status:
+            # the order's lines move to the new status bucket
+            lines = analytics_controller.order_lines_by_sandwich(db, item_id)
+            analytics_controller.apply_sales_change(
+                db,
+                [(before, sid, -amount) for sid, amount in lines]
+                + [(after, sid, amount) for sid, amount in lines],
+            )
         db.commit()
     except SQLAlchemyError as e:
         error = str(e.__dict__['orig'])
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
-    return item.first()
+    tracking_cache.invalidate(current.tracking_number)
+    updated = item.first()
+    if updated.status != previous_status:
+        _publish_status_change(updated, previous_status)
+    return updated
 
 
 def delete(db: Session, item_id):
@@ -178,8 +583,14 @@ def delete(db: Session, item_id):
         if not order:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
 
+        analytics_controller.apply_revenue_change(db, order, None)
+        analytics_controller.apply_sales_change(
+            db,
+            [(order, sid, -amount) for sid, amount in analytics_controller.order_lines_by_sandwich(db, order.id)],
+        )
         db.delete(order)
         db.commit()
+        tracking_cache.invalidate(order.tracking_number)
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(
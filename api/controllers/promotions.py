@@ -1,17 +1,84 @@
+import heapq
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from ..dependencies.cache import LRUCache
+from ..dependencies.config import conf
 from ..models import promotions as model
 from sqlalchemy.exc import SQLAlchemyError
 
+_FIELDS = ("id", "code", "description", "discount_type", "discount_value", "expires_at", "is_active")
+
+
+class PromotionIndex:
+    """
+    Every promotion as a read-only snapshot, keyed by id, plus the active
+    ones keyed by id and by code. Expiry times sit in a min-heap; each
+    lookup first pops the promotions whose expires_at has passed, so a
+    promotion stops being active at its expiry without a reload.
+    """
+
+    def __init__(self, promotions):
+        self._all = {p.id: p for p in promotions}
+        self._active = {p.id: p for p in promotions if p.is_active}
+        self._by_code = {p.code: p for p in self._active.values()}
+        self._expiry = [(p.expires_at, p.id) for p in self._active.values() if p.expires_at is not None]
+        heapq.heapify(self._expiry)
+        self._lock = threading.Lock()
+
+    def _expire(self, now: datetime) -> None:
+        with self._lock:
+            while self._expiry and self._expiry[0][0] < now:
+                _, promo_id = heapq.heappop(self._expiry)
+                promo = self._active.pop(promo_id, None)
+                if promo is not None:
+                    self._by_code.pop(promo.code, None)
+
+    def get(self, promo_id: int):
+        """The promotion with this id, active or not; None if it does not exist."""
+        return self._all.get(promo_id)
+
+    def active(self, promo_id: int, now: datetime | None = None):
+        self._expire(now or datetime.utcnow())
+        return self._active.get(promo_id)
+
+    def active_by_code(self, code: str, now: datetime | None = None):
+        self._expire(now or datetime.utcnow())
+        return self._by_code.get(code)
+
+
+# The whole promotions table is small; load it with one query and keep it
+# under the single key None. Promotion writes rebuild it straight away; the
+# TTL bounds how long other workers keep serving a stale copy.
+promo_cache = LRUCache("promotions", maxsize=1, ttl=conf.promo_cache_ttl)
+
+def promotion_index(db: Session, refresh: bool = False) -> PromotionIndex:
+    """The promotion index, from memory when cached."""
+    index = None if refresh else promo_cache.get(None)
+    if index is None:
+        generation = promo_cache.generation
+        rows = db.query(*(getattr(model.Promotion, f) for f in _FIELDS)).all()
+        index = PromotionIndex([SimpleNamespace(**row._asdict()) for row in rows])
+        promo_cache.set(None, index, generation)
+    return index
+
+def _refresh_index(db: Session) -> None:
+    promo_cache.invalidate()
+    promotion_index(db)
+
 def create(db: Session, request):
     new_item = model.Promotion(**request.dict())
     try:
         db.add(new_item)
         db.commit()
         db.refresh(new_item)
-        return new_item
     except SQLAlchemyError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    _refresh_index(db)
+    return new_item
 
 def read(db: Session):
     return db.query(model.Promotion).all()
@@ -28,12 +95,20 @@ def update(db: Session, request, item_id: int):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
     item.update(request.dict(exclude_unset=True), synchronize_session=False)
     db.commit()
+    _refresh_index(db)
     return item.first()
 
+def read_active_by_code(db: Session, code: str):
+    promo = promotion_index(db).active_by_code(code)
+    if not promo:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No active promotion with that code.")
+    return promo
+
 def delete(db: Session, item_id: int):
     item = db.query(model.Promotion).filter(model.Promotion.id == item_id)
     if not item.first():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
     item.delete(synchronize_session=False)
     db.commit()
+    _refresh_index(db)
     return {"deleted": item_id}
@@ -1,20 +1,35 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from ..controllers import analytics as analytics_controller
 from ..models import ratings as model
 from sqlalchemy.exc import SQLAlchemyError
+from ..dependencies.pagination import DEFAULT_PAGE_SIZE, keyset_page
+from ..dependencies.serialization import row_dicts, schema_columns
+from ..schemas import ratings as schema
+
+_RATING_COLUMNS = schema_columns(model.Rating.__table__, schema.Rating)
+
+def _check_stars(stars):
+    if stars is not None and not 1 <= stars <= 5:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Stars must be between 1 and 5.")
 
 def create(db: Session, request):
+    _check_stars(request.stars)
     new_item = model.Rating(**request.dict())
     try:
         db.add(new_item)
+        analytics_controller.apply_rating_change(db, None, new_item)
         db.commit()
         db.refresh(new_item)
-        return new_item
     except SQLAlchemyError as e:
+        db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return new_item
 
-def read(db: Session):
-    return db.query(model.Rating).all()
+def read(db: Session, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None):
+    """One page of ratings as plain dicts shaped like schemas.ratings.Rating."""
+    rows, next_cursor = keyset_page(db.query(*_RATING_COLUMNS), [model.Rating.id], limit, cursor)
+    return row_dicts(rows), next_cursor
 
 def read_one(db: Session, item_id: int):
     item = db.query(model.Rating).filter(model.Rating.id == item_id).first()
@@ -23,17 +38,23 @@ def read_one(db: Session, item_id: int):
     return item
 
 def update(db: Session, request, item_id: int):
+    _check_stars(request.stars)
     item = db.query(model.Rating).filter(model.Rating.id == item_id)
-    if not item.first():
+    before = item.with_entities(model.Rating.sandwich_id, model.Rating.stars).first()
+    if not before:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
     item.update(request.dict(exclude_unset=True), synchronize_session=False)
+    after = item.with_entities(model.Rating.sandwich_id, model.Rating.stars).one()
+    analytics_controller.apply_rating_change(db, before, after)
     db.commit()
     return item.first()
 
 def delete(db: Session, item_id: int):
     item = db.query(model.Rating).filter(model.Rating.id == item_id)
-    if not item.first():
+    before = item.with_entities(model.Rating.sandwich_id, model.Rating.stars).first()
+    if not before:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
     item.delete(synchronize_session=False)
+    analytics_controller.apply_rating_change(db, before, None)
     db.commit()
-    return {"deleted": item_id}
\ No newline at end of file
+    return {"deleted": item_id}
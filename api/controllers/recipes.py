@@ -1,29 +1,68 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException, status
+from ..dependencies.cache import LRUCache
+from ..dependencies.config import conf
 from ..models import recipes as model
+from ..models.sandwiches import Sandwich
 from sqlalchemy.exc import SQLAlchemyError
 
+# Bill of materials: {sandwich_id: ((resource_id, qty), ...)} for every recipe,
+# built with one query and kept under the single key None. Dropped by every
+# recipe write path.
+bom_cache = LRUCache("bom", maxsize=1, ttl=conf.bom_cache_ttl)
+
+def bill_of_materials(
+    db: Session, refresh: bool = False, max_age: float | None = None
+) -> dict[int, tuple[tuple[int, int], ...]]:
+    """
+    The recipe of every sandwich as (resource_id, qty) pairs, from memory when
+    cached. `max_age` (seconds) reloads a cached copy older than that.
+    """
+    bom = None if refresh else bom_cache.get(None, max_age=max_age)
+    if bom is None:
+        generation = bom_cache.generation
+        lines: dict[int, list] = {}
+        for sandwich_id, resource_id, amount in db.query(
+            model.Recipe.sandwich_id, model.Recipe.resource_id, model.Recipe.amount
+        ):
+            lines.setdefault(sandwich_id, []).append((resource_id, amount))
+        bom = {sandwich_id: tuple(items) for sandwich_id, items in lines.items()}
+        bom_cache.set(None, bom, generation)
+    return bom
+
 def create(db: Session, request):
     item = model.Recipe(**request.dict())
     try:
-        db.add(item); db.commit(); db.refresh(item); return item
+        db.add(item); db.commit(); db.refresh(item)
     except SQLAlchemyError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    bom_cache.invalidate()
+    return item
+
+# Recipe embeds its sandwich (with tag_ids) and resource; load them in bulk
+_WITH_RELATED = (
+    selectinload(model.Recipe.sandwich).selectinload(Sandwich.sandwich_tags),
+    selectinload(model.Recipe.resource),
+)
 
 def read(db: Session):
-    return db.query(model.Recipe).all()
+    return db.query(model.Recipe).options(*_WITH_RELATED).all()
 
 def read_one(db: Session, item_id: int):
-    item = db.query(model.Recipe).filter(model.Recipe.id == item_id).first()
+    item = db.query(model.Recipe).options(*_WITH_RELATED).filter(model.Recipe.id == item_id).first()
     if not item: raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
     return item
 
 def update(db: Session, request, item_id: int):
     q = db.query(model.Recipe).filter(model.Recipe.id == item_id)
     if not q.first(): raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-    q.update(request.dict(exclude_unset=True), synchronize_session=False); db.commit(); return q.first()
+    q.update(request.dict(exclude_unset=True), synchronize_session=False); db.commit()
+    bom_cache.invalidate()
+    return q.first()
 
 def delete(db: Session, item_id: int):
     q = db.query(model.Recipe).filter(model.Recipe.id == item_id)
     if not q.first(): raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-    q.delete(synchronize_session=False); db.commit(); return {"deleted": item_id}
+    q.delete(synchronize_session=False); db.commit()
+    bom_cache.invalidate()
+    return {"deleted": item_id}
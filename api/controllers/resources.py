@@ -1,14 +1,25 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import case, update as sql_update
 from fastapi import HTTPException, status
+from ..controllers import recipes as recipe_controller
+from ..dependencies.cache import LRUCache
+from ..dependencies.config import conf
 from ..models import resources as model
 from sqlalchemy.exc import SQLAlchemyError
 
+# {sandwich_id: max makeable} under the key None, with the BOM generation it
+# was computed from. Short TTL: every order moves stock, so this is a display
+# value; reserve() still enforces the real limits.
+capacity_cache = LRUCache("capacity", maxsize=1, ttl=conf.capacity_cache_ttl)
+
 def create(db: Session, request):
     item = model.Resource(**request.dict())
     try:
-        db.add(item); db.commit(); db.refresh(item); return item
+        db.add(item); db.commit(); db.refresh(item)
     except SQLAlchemyError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    capacity_cache.invalidate()
+    return item
 
 def read(db: Session):
     return db.query(model.Resource).all()
@@ -21,9 +32,123 @@ def read_one(db: Session, item_id: int):
 def update(db: Session, request, item_id: int):
     q = db.query(model.Resource).filter(model.Resource.id == item_id)
     if not q.first(): raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-    q.update(request.dict(exclude_unset=True), synchronize_session=False); db.commit(); return q.first()
+    q.update(request.dict(exclude_unset=True), synchronize_session=False); db.commit()
+    capacity_cache.invalidate()
+    return q.first()
 
 def delete(db: Session, item_id: int):
     q = db.query(model.Resource).filter(model.Resource.id == item_id)
     if not q.first(): raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-    q.delete(synchronize_session=False); db.commit(); return {"deleted": item_id}
+    q.delete(synchronize_session=False); db.commit()
+    capacity_cache.invalidate()
+    return {"deleted": item_id}
+
+
+def required_ingredients(db: Session, lines) -> dict[int, int]:
+    """
+    Turn (sandwich_id, amount) pairs into the total quantity needed per resource.
+
+    Recipes come from the in-memory bill of materials, but only a copy at most
+    conf.reserve_bom_max_age seconds old: a recipe edited in another worker
+    would otherwise under- or over-reserve until BOM_CACHE_TTL ran out. It is
+    also reloaded once if a sandwich is missing, in case its recipe was just
+    added. Raises HTTP 400 if a sandwich has no recipe, since its stock cannot
+    be checked.
+    """
+    wanted: dict[int, int] = {}
+    for sandwich_id, amount in lines:
+        wanted[sandwich_id] = wanted.get(sandwich_id, 0) + amount
+
+    bom = recipe_controller.bill_of_materials(db, max_age=conf.reserve_bom_max_age)
+    if any(sid not in bom for sid in wanted):
+        bom = recipe_controller.bill_of_materials(db, refresh=True)
+
+    missing = [sid for sid in wanted if sid not in bom]
+    if missing:
+        if len(wanted) == 1:
+            detail = "No recipe defined for this sandwich; cannot check ingredients."
+        else:
+            detail = f"No recipe defined for sandwich(es) {missing}; cannot check ingredients."
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+    required: dict[int, int] = {}
+    for sandwich_id, amount in wanted.items():
+        for resource_id, qty in bom[sandwich_id]:
+            required[resource_id] = required.get(resource_id, 0) + qty * amount
+    return required
+
+
+def capacity(db: Session) -> dict[int, int]:
+    """
+    How many of each sandwich current stock could make on its own:
+    {sandwich_id: min(stock // qty over its recipe)}. Sandwiches without a
+    recipe are left out. One stock query plus a single pass over the BOM.
+    """
+    cached = capacity_cache.get(None)
+    if cached is not None and cached[0] == recipe_controller.bom_cache.generation:
+        return cached[1]
+
+    generation = capacity_cache.generation
+    bom_generation = recipe_controller.bom_cache.generation
+    bom = recipe_controller.bill_of_materials(db)
+    stock = dict(db.query(model.Resource.id, model.Resource.amount).all())
+
+    result = {}
+    for sandwich_id, items in bom.items():
+        limits = [max(stock.get(resource_id, 0), 0) // qty for resource_id, qty in items if qty > 0]
+        if limits:
+            result[sandwich_id] = min(limits)
+    capacity_cache.set(None, (bom_generation, result), generation)
+    return result
+
+
+def reserve(db: Session, required: dict[int, int]) -> None:
+    """
+    Atomically decrement inventory by `required` ({resource_id: quantity}).
+
+    All rows are checked and decremented by one guarded UPDATE: a row only
+    changes if `amount >= required`, so two concurrent orders can never both
+    take the last units. If any row is short, the transaction is rolled back
+    and HTTP 400 is raised with one entry per failing ingredient.
+
+    The caller owns the transaction and must commit on success.
+    """
+    required = {rid: qty for rid, qty in required.items() if qty > 0}
+    if not required:
+        return
+
+    needed = case(required, value=model.Resource.id)
+    result = db.execute(
+        sql_update(model.Resource)
+        .where(model.Resource.id.in_(required))
+        .where(model.Resource.amount >= needed)
+        .values(amount=model.Resource.amount - needed)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == len(required):
+        return
+
+    # At least one guard failed: undo the partial decrement and report why.
+    db.rollback()
+    stock = {
+        row.id: row
+        for row in db.query(model.Resource.id, model.Resource.item, model.Resource.amount)
+        .filter(model.Resource.id.in_(required))
+        .all()
+    }
+
+    parts = []
+    for resource_id, qty in required.items():
+        row = stock.get(resource_id)
+        if row is None:
+            parts.append("Recipe references a missing resource.")
+        elif row.amount < qty:
+            parts.append(f"{row.item}: required {qty}, available {row.amount}")
+    if not parts:
+        # Stock was replenished between the UPDATE and the re-read.
+        parts.append("inventory changed while reserving; please retry")
+
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Insufficient ingredients: " + "; ".join(parts),
+    )
@@ -1,61 +1,129 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
+from ..controllers import analytics as analytics_controller
+from ..controllers import recipes as recipe_controller
+from ..controllers import resources as resource_controller
+from ..dependencies.cache import LRUCache
+from ..dependencies.config import conf
 from ..models import sandwiches as model
+from ..models.sandwich_rating_stats import SandwichRatingStats
 from ..models.tags import Tag, SandwichTag
+from ..schemas import sandwiches as schema
+from ..schemas.ratings import RatingSummary
 
-def _set_sandwich_tags(db: Session, sandwich: model.Sandwich, tag_ids: list[int]) -> None:
-    # ensure tags exist
+# Full menu (key None) and per-tag results, as already-serialized schema objects.
+# Invalidated by every sandwich and tag write path. Ratings and capacity change
+# far more often than the menu, so they are not cached here but stamped on
+# each read.
+menu_cache = LRUCache("menu", maxsize=256, ttl=conf.menu_cache_ttl)
+
+def _check_tags(db: Session, tag_ids: list[int]) -> None:
+    # ensure tags exist; called before anything is written
     if tag_ids:
-        tags = db.query(Tag).filter(Tag.id.in_(tag_ids)).all()
-        if len(tags) != len(set(tag_ids)):
+        found = db.query(Tag.id).filter(Tag.id.in_(tag_ids)).count()
+        if found != len(set(tag_ids)):
             raise HTTPException(
                 status_code=400,
                 detail="One or more tag_ids do not exist.",
             )
 
+def _set_sandwich_tags(sandwich: model.Sandwich, tag_ids: list[int]) -> None:
     sandwich.sandwich_tags.clear()  # remove old links
 
     for tid in tag_ids:
         link = SandwichTag(sandwich_id=sandwich.id, tag_id=tid)
         sandwich.sandwich_tags.append(link)
 
-def search_by_tag(db: Session, tag_name: str | None):
-    q = db.query(model.Sandwich)
+def _menu_query(tag_name: str | None):
+    # tag_ids comes from sandwich_tags; one query for all rows
+    stmt = select(model.Sandwich).options(selectinload(model.Sandwich.sandwich_tags))
 
     if tag_name:
-        q = (
-            q.join(SandwichTag, SandwichTag.sandwich_id == model.Sandwich.id)
-             .join(Tag, Tag.id == SandwichTag.tag_id)
-             .filter(Tag.name == tag_name)
+        stmt = (
+            stmt.join(SandwichTag, SandwichTag.sandwich_id == model.Sandwich.id)
+                .join(Tag, Tag.id == SandwichTag.tag_id)
+                .where(Tag.name == tag_name)
         )
+    return stmt
+
+def _to_menu(rows) -> list[schema.Sandwich]:
+    return [schema.Sandwich.model_validate(row, from_attributes=True) for row in rows]
+
+def _ratings(db: Session, sandwich_ids: list[int]) -> dict[int, RatingSummary]:
+    """Rating summaries for `sandwich_ids`: one primary-key lookup in the rollup."""
+    stats = {}
+    if sandwich_ids:
+        stats = {
+            row.sandwich_id: row
+            for row in db.query(SandwichRatingStats).filter(SandwichRatingStats.sandwich_id.in_(sandwich_ids))
+        }
+    return {
+        sandwich_id: RatingSummary(**analytics_controller.rating_summary(stats.get(sandwich_id)))
+        for sandwich_id in sandwich_ids
+    }
+
+def _live_fields(db: Session, menu: list[schema.Sandwich]) -> tuple[dict, dict]:
+    return resource_controller.capacity(db), _ratings(db, [item.id for item in menu])
+
+def _with_live_fields(menu: list[schema.Sandwich], live: tuple[dict, dict]) -> list[schema.Sandwich]:
+    # cached entries are shared; stamp capacity and ratings on copies
+    capacity, ratings = live
+    return [
+        item.model_copy(update={"max_makeable": capacity.get(item.id), "rating": ratings.get(item.id)})
+        for item in menu
+    ]
 
-    return q.all()
+def search_by_tag(db: Session, tag_name: str | None):
+    key = tag_name or None
+    menu = menu_cache.get(key)
+    if menu is None:
+        generation = menu_cache.generation
+        menu = _to_menu(db.execute(_menu_query(key)).scalars().all())
+        menu_cache.set(key, menu, generation)
+    return _with_live_fields(menu, _live_fields(db, menu))
+
+async def search_by_tag_async(db: AsyncSession, tag_name: str | None):
+    key = tag_name or None
+    menu = menu_cache.get(key)
+    if menu is None:
+        generation = menu_cache.generation
+        result = await db.execute(_menu_query(key))
+        menu = _to_menu(result.scalars().all())
+        menu_cache.set(key, menu, generation)
+    return _with_live_fields(menu, await db.run_sync(_live_fields, menu))
 
 def create(db: Session, request):
     data = request.dict()
     tag_ids = data.pop("tag_ids", []) or []
+    # a bad tag must fail before the sandwich is committed, or the menu
+    # cache would keep serving a menu without it
+    _check_tags(db, tag_ids)
 
     sandwich = model.Sandwich(**data)
     db.add(sandwich)
+    db.flush()
+    _set_sandwich_tags(sandwich, tag_ids)
     db.commit()
     db.refresh(sandwich)
 
-    if tag_ids:
-        _set_sandwich_tags(db, sandwich, tag_ids)
-        db.commit()
-        db.refresh(sandwich)
-
+    menu_cache.invalidate()
     return sandwich
 
 def read(db: Session):
-    return db.query(model.Sandwich).all()
+    return search_by_tag(db, None)
+
+async def read_async(db: AsyncSession):
+    return await search_by_tag_async(db, None)
 
 def read_one(db: Session, item_id: int):
-    item = db.query(model.Sandwich).filter(model.Sandwich.id == item_id).first()
+    item = db.execute(_menu_query(None).where(model.Sandwich.id == item_id)).scalars().first()
     if not item: raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-    return item
+    menu = _to_menu([item])
+    return _with_live_fields(menu, _live_fields(db, menu))[0]
 
 def update(db: Session, request, item_id: int):
     sandwich = db.query(model.Sandwich).filter(model.Sandwich.id == item_id).first()
@@ -64,21 +132,25 @@ def update(db: Session, request, item_id: int):
 
     data = request.dict(exclude_unset=True)
     tag_ids = data.pop("tag_ids", None)
+    if tag_ids is not None:
+        _check_tags(db, tag_ids)
 
-    if data:
-        for k, v in data.items():
-            setattr(sandwich, k, v)
-        db.commit()
-        db.refresh(sandwich)
-
+    # fields and tags are written in one commit, so a rejected tag list
+    # leaves the sandwich (and the cached menu) as it was
+    for k, v in data.items():
+        setattr(sandwich, k, v)
     if tag_ids is not None:
-        _set_sandwich_tags(db, sandwich, tag_ids or [])
-        db.commit()
-        db.refresh(sandwich)
+        _set_sandwich_tags(sandwich, tag_ids or [])
+    db.commit()
+    db.refresh(sandwich)
 
+    menu_cache.invalidate()
     return sandwich
 
 def delete(db: Session, item_id: int):
     q = db.query(model.Sandwich).filter(model.Sandwich.id == item_id)
     if not q.first(): raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Id not found!")
-    q.delete(synchronize_session=False); db.commit(); return {"deleted": item_id}
+    q.delete(synchronize_session=False); db.commit()
+    menu_cache.invalidate()
+    recipe_controller.bom_cache.invalidate()
+    return {"deleted": item_id}
@@ -0,0 +1,18 @@
+from ..dependencies import cache
+from ..dependencies.database import async_engine, engine
+from ..dependencies.pool import pool_stats
+
+
+def get_db_pool_stats():
+    """
+    Report connection pool usage: checked-out and idle connections,
+    overflow in use and time spent acquiring connections.
+    """
+    stats = pool_stats(engine)
+    stats["async"] = pool_stats(async_engine.sync_engine)
+    return stats
+
+
+def get_cache_stats():
+    """Size and hit/miss counters for every in-process cache."""
+    return cache.all_stats()
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
 from ..models import tags as model
+from ..controllers.sandwiches import menu_cache
 
 
 def create(db: Session, request):
@@ -10,6 +11,7 @@ def create(db: Session, request):
         db.add(item)
         db.commit()
         db.refresh(item)
+        menu_cache.invalidate()
         return item
     except SQLAlchemyError as e:
         raise HTTPException(
@@ -41,6 +43,8 @@ def update(db: Session, request, item_id: int):
         )
     q.update(request.dict(exclude_unset=True), synchronize_session=False)
     db.commit()
+    # a renamed tag changes which sandwiches /menu/search?tag= returns
+    menu_cache.invalidate()
     return q.first()
 
 
@@ -53,4 +57,5 @@ def delete(db: Session, item_id: int):
         )
     q.delete(synchronize_session=False)
     db.commit()
+    menu_cache.invalidate()
     return {"deleted": item_id}
@@ -0,0 +1,84 @@
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+
+def increment(db: Session, model, keys: dict, deltas: dict) -> None:
+    """
+    Add `deltas` to the counters of the `model` row identified by `keys`,
+    creating the row if it does not exist, in a single upsert statement.
+
+    Concurrent increments to the same row are applied by the database,
+    so no read-modify-write happens in Python. Does not commit.
+    """
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        stmt = mysql_insert(table).values({**keys, **deltas})
+        stmt = stmt.on_duplicate_key_update({c: table.c[c] + stmt.inserted[c] for c in deltas})
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        stmt = sqlite_insert(table).values({**keys, **deltas})
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={c: table.c[c] + stmt.excluded[c] for c in deltas},
+        )
+    else:
+        result = db.execute(
+            update(table)
+            .where(*(table.c[k] == v for k, v in keys.items()))
+            .values({c: table.c[c] + d for c, d in deltas.items()})
+        )
+        if result.rowcount:
+            return
+        stmt = insert(table).values({**keys, **deltas})
+
+    db.execute(stmt)
+
+
+def increment_many(db: Session, model, key_columns: list[str], rows: list[dict]) -> None:
+    """
+    `increment` for many rows at once: each dict in `rows` holds the key
+    columns plus the counter deltas. MySQL and SQLite apply them in one
+    multi-row upsert; other dialects fall back to one `increment` per row.
+    Keys must be distinct within `rows`. Does not commit.
+    """
+    rows = [row for row in rows if any(v for c, v in row.items() if c not in key_columns)]
+    if not rows:
+        return
+
+    table = model.__table__
+    counters = [c for c in rows[0] if c not in key_columns]
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        stmt = mysql_insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update({c: table.c[c] + stmt.inserted[c] for c in counters})
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        stmt = sqlite_insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={c: table.c[c] + stmt.excluded[c] for c in counters},
+        )
+    else:
+        for row in rows:
+            increment(
+                db,
+                model,
+                {k: row[k] for k in key_columns},
+                {c: row[c] for c in counters},
+            )
+        return
+
+    db.execute(stmt)
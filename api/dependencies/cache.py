@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+
+_caches: dict[str, "LRUCache"] = {}
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU cache with optional TTL and hit/miss counters.
+
+    Each worker process has its own copy, so writes made in one worker only
+    invalidate that worker's entries; `ttl` bounds how stale the others get.
+
+    `generation` changes on every invalidation. Readers capture it before
+    querying the database and pass it to `set`, so a result computed from
+    data older than the last invalidation is never stored.
+
+    A caller that needs fresher data than `ttl` allows can pass `max_age`
+    to `get`; older entries are then treated as a miss for that call only.
+    """
+
+    def __init__(self, name: str, maxsize: int = 128, ttl: float | None = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        _caches[name] = self
+
+    def get(self, key, default=None, max_age: float | None = None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                stored_at, expires_at, value = entry
+                now = time.monotonic()
+                if expires_at is not None and expires_at <= now:
+                    del self._data[key]
+                elif max_age is None or now - stored_at <= max_age:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return default
+
+    def set(self, key, value, generation: int | None = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            now = time.monotonic()
+            self._data[key] = (now, now + self.ttl if self.ttl else None, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key=None) -> None:
+        """Drop one entry, or everything when no key is given."""
+        with self._lock:
+            self.generation += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def all_stats() -> dict:
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def invalidate_all() -> None:
+    for cache in _caches.values():
+        cache.invalidate()
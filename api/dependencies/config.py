@@ -1,8 +1,52 @@
+import os
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 class conf:
-    db_host = "localhost"
-    db_name = "sandwich_maker_api"
-    db_port = 3306
-    db_user = "root"
-    db_password = "Adam_2018"
-    app_host = "localhost"
-    app_port = 8000
+    # Every setting can be overridden from the environment, e.g. DB_PASSWORD=...
+    db_host = os.getenv("DB_HOST", "localhost")
+    db_name = os.getenv("DB_NAME", "sandwich_maker_api")
+    db_port = int(os.getenv("DB_PORT", 3306))
+    db_user = os.getenv("DB_USER", "root")
+    db_password = os.getenv("DB_PASSWORD", "Adam_2018")
+    # Full SQLAlchemy URL; when set it replaces the db_* fields above
+    # (e.g. sqlite:///./sandwich.db for local runs).
+    db_url = os.getenv("DATABASE_URL")
+
+    # Connection pool (ignored for SQLite)
+    db_pool_size = int(os.getenv("DB_POOL_SIZE", 5))
+    db_max_overflow = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    db_pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    db_pool_recycle = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    db_pool_pre_ping = _env_bool("DB_POOL_PRE_PING", True)
+
+    # What the app does to the schema on startup:
+    #   "migrate" - create missing tables/indexes only (default, keeps data)
+    #   "reset"   - drop everything and reseed (local testing only)
+    #   "skip"    - do nothing; schema is managed with `python -m api.cli`
+    db_startup = os.getenv("DB_STARTUP", "migrate")
+
+    # Seconds a worker may serve a cached menu written by another worker
+    menu_cache_ttl = float(os.getenv("MENU_CACHE_TTL", 60))
+    # Same for the recipe index (bill of materials) used by checkout
+    bom_cache_ttl = float(os.getenv("BOM_CACHE_TTL", 300))
+    # Checkout reserves stock from the recipe index; it reloads it when older
+    # than this, so a recipe changed in another worker is picked up quickly
+    reserve_bom_max_age = float(os.getenv("RESERVE_BOM_MAX_AGE", 2))
+    # Seconds the per-sandwich "can still make N" numbers may lag stock
+    capacity_cache_ttl = float(os.getenv("CAPACITY_CACHE_TTL", 5))
+    # Same for the promotion index used to validate promo codes on orders
+    promo_cache_ttl = float(os.getenv("PROMO_CACHE_TTL", 60))
+    # Seconds an order tracking response may lag a change made in another worker
+    tracking_cache_ttl = float(os.getenv("TRACKING_CACHE_TTL", 2))
+
+    log_level = os.getenv("LOG_LEVEL", "INFO")
+
+    app_host = os.getenv("APP_HOST", "localhost")
+    app_port = int(os.getenv("APP_PORT", 8000))
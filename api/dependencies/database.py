@@ -1,14 +1,65 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config import conf
+from .instrumentation import instrument_engine
+from .pool import InstrumentedQueuePool
 from urllib.parse import quote_plus
 
-SQLALCHEMY_DATABASE_URL = f"mysql+pymysql://{conf.db_user}:{quote_plus(conf.db_password)}@{conf.db_host}:{conf.db_port}/{conf.db_name}?charset=utf8mb4"
+SQLALCHEMY_DATABASE_URL = conf.db_url or (
+    f"mysql+pymysql://{conf.db_user}:{quote_plus(conf.db_password)}@{conf.db_host}:{conf.db_port}/{conf.db_name}?charset=utf8mb4"
+)
+
+
+# Async drivers for the sync URLs above
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _async_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    return parsed.set(drivername=driver).render_as_string(hide_password=False) if driver else url
+
+
+def _engine_options(url: str, is_async: bool = False) -> dict:
+    if url.startswith("sqlite"):
+        # SQLite picks its own pool; allow use from FastAPI's threadpool
+        return {} if is_async else {"connect_args": {"check_same_thread": False}}
+    options = {
+        "pool_size": conf.db_pool_size,
+        "max_overflow": conf.db_max_overflow,
+        "pool_timeout": conf.db_pool_timeout,
+        "pool_recycle": conf.db_pool_recycle,
+        "pool_pre_ping": conf.db_pool_pre_ping,
+    }
+    if not is_async:
+        # async engines need an asyncio-aware pool, so only time the sync one
+        options["poolclass"] = InstrumentedQueuePool
+    return options
+
+
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL
+    SQLALCHEMY_DATABASE_URL,
+    **_engine_options(SQLALCHEMY_DATABASE_URL),
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ASYNC_DATABASE_URL = _async_url(SQLALCHEMY_DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **_engine_options(ASYNC_DATABASE_URL, is_async=True),
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
 Base = declarative_base()
 
 
@@ -18,3 +69,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,16 @@
+import hashlib
+
+
+def etag_for(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True when an If-None-Match header lists `etag` (or is `*`)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison, as RFC 9110 requires for If-None-Match
+    return etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
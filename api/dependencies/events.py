@@ -0,0 +1,84 @@
+"""
+Publish/subscribe for live order updates.
+
+The app talks to whatever `get_broker()` returns. The default
+`InProcessBroker` only reaches subscribers connected to the same worker
+process; for several workers, install a broker backed by a shared channel
+(Redis pub/sub, Postgres LISTEN/NOTIFY, ...) with `set_broker()` at start-up.
+Any object with the same `publish` / `subscribe` methods works.
+"""
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Protocol
+
+
+class Broker(Protocol):
+    def publish(self, channel: str, event: dict) -> None:
+        """Deliver `event` to every current subscriber of `channel`. Never blocks."""
+
+    def subscribe(self, channel: str):
+        """Async context manager yielding an object whose `await get()` returns the next event."""
+
+
+class InProcessBroker:
+    """
+    Fan-out to asyncio queues in this process. `publish` is safe to call
+    from sync routes running in the threadpool. A subscriber that falls
+    `queue_size` events behind loses its oldest events.
+    """
+
+    def __init__(self, queue_size: int = 16):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, event: dict) -> None:
+        with self._lock:
+            targets = list(self._subscribers.get(channel, ()))
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(self._offer, queue, event)
+
+    def _offer(self, queue: asyncio.Queue, event: dict) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        entry = (asyncio.get_running_loop(), asyncio.Queue(self.queue_size))
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(channel)
+                subscribers.discard(entry)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+
+_broker: Broker = InProcessBroker()
+
+
+def get_broker() -> Broker:
+    return _broker
+
+
+def set_broker(broker: Broker) -> None:
+    global _broker
+    _broker = broker
+
+
+def sse(data: dict | str, event: str | None = None) -> str:
+    """One Server-Sent Events message."""
+    payload = data if isinstance(data, str) else json.dumps(data, default=str)
+    lines = [f"event: {event}"] if event else []
+    lines += [f"data: {line}" for line in payload.splitlines()]
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,104 @@
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+logger = logging.getLogger("api.sql")
+
+_current: ContextVar["RequestSQLStats | None"] = ContextVar("request_sql_stats", default=None)
+
+
+class RequestSQLStats:
+    """SQL statements run while serving one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+
+# The start time lives on the statement's execution context, which is dropped
+# with the statement; after_cursor_execute does not fire for a statement that
+# raises, so anything kept on the (pooled) connection would pile up.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_start", None)
+    stats = _current.get()
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def instrument_engine(engine) -> None:
+    """Time every statement on `engine` (pass `.sync_engine` for async engines)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SQLInstrumentationMiddleware:
+    """
+    Count and time the SQL each request runs. Adds a `Server-Timing` header
+    (db time, statement count) and `X-DB-Queries`, and logs one JSON line per
+    request with the slowest statement.
+
+    Streaming responses send headers before their body is produced, so the
+    headers only cover queries up to that point; the log line covers all.
+    """
+
+    def __init__(self, app, slow_statement_chars: int = 300):
+        self.app = app
+        self.slow_statement_chars = slow_statement_chars
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSQLStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={stats.total_seconds * 1000:.2f};desc="{stats.count} queries"'.encode(),
+                ))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            logger.info(json.dumps({
+                "event": "request_sql",
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "status": status_code,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "db_queries": stats.count,
+                "db_ms": round(stats.total_seconds * 1000, 2),
+                "slowest_ms": round(stats.slowest_seconds * 1000, 2),
+                "slowest_sql": (stats.slowest_statement or "")[: self.slow_statement_chars] or None,
+            }))
@@ -0,0 +1,104 @@
+"""
+Prometheus metrics for the API.
+
+With a single process the default registry is scraped directly. When running
+several uvicorn workers, point `PROMETHEUS_MULTIPROC_DIR` at an empty
+directory before start-up: every worker then writes its samples there and
+`/metrics` aggregates all of them, whichever worker answers the scrape.
+"""
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# --- HTTP ---
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests served.", ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time spent serving HTTP requests.",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.",
+    ["method"], multiprocess_mode="livesum",
+)
+ERRORS = Counter(
+    "http_request_errors_total", "HTTP responses with a 4xx or 5xx status.",
+    ["method", "route", "status"],
+)
+
+# --- Domain ---
+ORDERS_CREATED = Counter(
+    "orders_created_total", "Orders created.", ["source"]
+)
+INVENTORY_REJECTIONS = Counter(
+    "inventory_rejections_total", "Order lines rejected for insufficient ingredients.", ["source"]
+)
+PROMO_REJECTIONS = Counter(
+    "promo_rejections_total", "Orders rejected because of their promotion.", ["reason"]
+)
+
+
+def render() -> tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, plus its content type."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def worker_exit() -> None:
+    """Drop this worker's live gauges from the shared directory."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class PrometheusMiddleware:
+    """
+    Count, time and track in-flight HTTP requests. Routes are labelled by
+    their path template (`/orders/{item_id}`), never the raw path, so label
+    cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.labels(method).inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_FLIGHT.labels(method).dec()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            if status_code >= 400:
+                ERRORS.labels(method, route, str(status_code)).inc()
@@ -0,0 +1,66 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("wrong number of values")
+        return [
+            datetime.fromisoformat(v) if key.type.python_type is datetime else key.type.python_type(v)
+            for key, v in zip(keys, values)
+        ]
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor.",
+        )
+
+
+def _after(keys, values):
+    """(k1, k2, ...) > (v1, v2, ...), spelled out so every backend can use the index."""
+    key, value = keys[0], values[0]
+    if len(keys) == 1:
+        return key > value
+    return or_(key > value, and_(key == value, _after(keys[1:], values[1:])))
+
+
+def keyset_page(q, keys, limit: int, cursor: str | None = None, key_of=None):
+    """
+    Return one page of `q` ordered by `keys` (unique as a whole, ascending)
+    plus the cursor for the next page, or None on the last page.
+
+    Each page is a range scan starting after the previous page's last key,
+    so cost does not grow with how deep the client has paged.
+    `key_of(row)` extracts the key values from a row; by default the
+    attributes named like the key columns are used.
+    """
+    if cursor:
+        q = q.filter(_after(keys, decode_cursor(cursor, keys)))
+
+    rows = q.order_by(*keys).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    values = key_of(last) if key_of else [getattr(last, key.key) for key in keys]
+    return rows, encode_cursor(values)
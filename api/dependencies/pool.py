@@ -0,0 +1,77 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class AcquireStats:
+    """Running totals for how long callers waited to get a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.timeouts = 0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "count": self.count,
+                "total_seconds": round(self.total_seconds, 6),
+                "avg_ms": round(self.total_seconds / self.count * 1000, 3) if self.count else 0.0,
+                "max_ms": round(self.max_seconds * 1000, 3),
+                "timeouts": self.timeouts,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that times every checkout, including time spent blocked
+    waiting for a free connection and opening new ones.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.acquire_stats = AcquireStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.acquire_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.acquire_stats.record(time.perf_counter() - start)
+        return conn
+
+
+def pool_stats(engine) -> dict:
+    """Current usage of `engine`'s connection pool."""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status()}
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                # overflow() goes negative while fewer than `size` connections exist
+                "overflow_in_use": max(pool.overflow(), 0),
+                "timeout_seconds": pool.timeout(),
+            }
+        )
+    acquire = getattr(pool, "acquire_stats", None)
+    if acquire is not None:
+        stats["acquire"] = acquire.snapshot()
+    return stats
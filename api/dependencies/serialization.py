@@ -0,0 +1,80 @@
+"""
+Fast JSON for large list responses.
+
+Returning ORM objects with a `response_model` makes FastAPI hydrate every
+row into an ORM instance, validate it into a Pydantic model and only then
+encode it. The list and export paths instead select plain column rows,
+turn them into dicts shaped like the response schema and encode those
+directly with orjson (falling back to the standard library when it is
+not installed). Values come straight from the database, so there is
+nothing to validate.
+"""
+import enum
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi import Response
+from sqlalchemy import Float, Numeric, type_coerce
+
+from .pagination import NEXT_CURSOR_HEADER
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+
+def _default(value):
+    # orjson handles datetime and Enum natively; the stdlib fallback does not
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode `content` as compact JSON, the same way Pydantic renders these schemas."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    """JSON response for content that is already plain dicts/lists of DB values."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def schema_columns(table, schema) -> list:
+    """
+    The columns of `table` named like the fields of `schema`, in field
+    order. DECIMAL columns the schema exposes as float are read as float,
+    which skips building a Decimal per value only to convert it back.
+    """
+    columns = []
+    for name, field in schema.model_fields.items():
+        if name not in table.c:
+            continue
+        column = table.c[name]
+        if field.annotation is float and isinstance(column.type, Numeric):
+            column = type_coerce(column, Float).label(name)
+        columns.append(column)
+    return columns
+
+
+def row_dicts(rows) -> list[dict]:
+    """Column rows (from `db.query(*columns)` or a Core select) as dicts."""
+    return [row._asdict() for row in rows]
+
+
+def page_response(items: list, next_cursor: str | None) -> FastJSONResponse:
+    """One page of a keyset-paginated list, with the next-page cursor header when there is one."""
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return FastJSONResponse(items, headers=headers)
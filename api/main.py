@@ -1,12 +1,37 @@
+import logging
+import time
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import index as indexRoute
 from .models import model_loader
 from .dependencies.config import conf
+from .dependencies import metrics
+from .dependencies.instrumentation import SQLInstrumentationMiddleware
+from .dependencies.pagination import NEXT_CURSOR_HEADER
+
+_boot_started = time.perf_counter()
+logging.basicConfig(level=conf.log_level, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if conf.db_startup == "reset":
+        model_loader.index()
+    elif conf.db_startup == "migrate":
+        model_loader.init_db()
+    logger.info(
+        "Startup (DB_STARTUP=%s) finished %.0f ms after import.",
+        conf.db_startup, (time.perf_counter() - _boot_started) * 1000,
+    )
+    yield
+    metrics.worker_exit()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 origins = ["*"]
 
@@ -16,11 +41,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Server-Timing", "X-DB-Queries"],
 )
+app.add_middleware(SQLInstrumentationMiddleware)
+app.add_middleware(metrics.PrometheusMiddleware)
 
-model_loader.index()
 indexRoute.load_routes(app)
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host=conf.app_host, port=conf.app_port)
\ No newline at end of file
+    uvicorn.run(app, host=conf.app_host, port=conf.app_port)
@@ -0,0 +1,16 @@
+# Import every model so relationship() names resolve no matter which module
+# is imported first (loader options built at import time configure mappers).
+from . import (  # noqa: F401
+    daily_revenue,
+    order_details,
+    orders,
+    promotions,
+    ratings,
+    recipes,
+    resources,
+    sandwich_daily_sales,
+    sandwich_rating_stats,
+    sandwiches,
+    schema_version,
+    tags,
+)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, DECIMAL, DATE
+from ..dependencies.database import Base
+
+
+class DailyRevenue(Base):
+    """
+    Paid revenue per calendar day (UTC, by order_date), kept current by the
+    order write paths so /staff/revenue never scans orders.
+    """
+    __tablename__ = "daily_revenue"
+
+    day = Column(DATE, primary_key=True)
+    total_revenue = Column(DECIMAL(14, 2), nullable=False, default=0)
+    order_count = Column(Integer, nullable=False, default=0)
@@ -1,6 +1,11 @@
+import logging
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
-from . import orders, order_details, recipes, sandwiches, resources, promotions, ratings, tags
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from . import orders, order_details, recipes, sandwiches, resources, promotions, ratings, tags, schema_version, daily_revenue, sandwich_rating_stats, sandwich_daily_sales
 from .orders import Order, OrderStatus, OrderType, PaymentStatus
 from .order_details import OrderDetail
 from .sandwiches import Sandwich
@@ -9,28 +14,162 @@ from .recipes import Recipe
 from .promotions import Promotion
 from .ratings import Rating
 from .tags import Tag, SandwichTag
-from ..dependencies.database import engine, SessionLocal
+from .schema_version import SchemaVersion
+from ..dependencies.database import Base, engine, SessionLocal
+from ..controllers import analytics
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a table or index is added so existing databases pick it up.
+SCHEMA_VERSION = 6
+
+
+def _backfill_rollups(bind):
+    db = Session(bind=bind)
+    try:
+        analytics.rebuild_daily_revenue(db)
+        analytics.rebuild_rating_stats(db)
+        analytics.rebuild_sandwich_daily_sales(db)
+    finally:
+        db.close()
+
+
+def _drop_obsolete_indexes(bind):
+    # single-column indexes on `amount` that no query used
+    obsolete = {
+        "order_details": "ix_order_details_amount",
+        "recipes": "ix_recipes_amount",
+        "resources": "ix_resources_amount",
+    }
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table, name in obsolete.items():
+            if name not in {idx["name"] for idx in inspector.get_indexes(table)}:
+                continue
+            if bind.dialect.name == "mysql":
+                conn.execute(text(f"DROP INDEX {name} ON {table}"))
+            else:
+                conn.execute(text(f"DROP INDEX {name}"))
+
+
+# Data steps to run once when an existing database moves past a version,
+# after its new tables have been created. Each step runs at most once per
+# upgrade, however many versions it is listed under.
+UPGRADES = {
+    2: _backfill_rollups,
+    3: _drop_obsolete_indexes,
+    5: _backfill_rollups,
+    6: _backfill_rollups,
+}
+
+# MySQL named lock held while one process brings the schema up to date
+INIT_LOCK_NAME = "sandwich_api_init_db"
+INIT_LOCK_TIMEOUT = 300
+
+
+@contextmanager
+def _init_lock(bind):
+    """
+    Serialize init_db across processes (e.g. uvicorn workers starting
+    together). On MySQL this is GET_LOCK on a dedicated connection; SQLite
+    is only ever used by one host, where its file lock already serializes
+    the writes.
+    """
+    if bind.dialect.name != "mysql":
+        yield
+        return
+    with bind.connect() as conn:
+        acquired = conn.execute(
+            text("SELECT GET_LOCK(:name, :timeout)"),
+            {"name": INIT_LOCK_NAME, "timeout": INIT_LOCK_TIMEOUT},
+        ).scalar()
+        if acquired != 1:
+            raise RuntimeError(f"Timed out waiting for the {INIT_LOCK_NAME} lock.")
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": INIT_LOCK_NAME})
+
+
+def _stored_version(bind):
+    """The recorded schema version; 0 for a database created before versioning, None if empty."""
+    inspector = inspect(bind)
+    if not inspector.has_table(SchemaVersion.__tablename__):
+        # tables from before schema_version existed still need every upgrade
+        return 0 if inspector.has_table(Order.__tablename__) else None
+    db = Session(bind=bind)
+    try:
+        row = db.get(SchemaVersion, 1)
+        return row.version if row else 0
+    finally:
+        db.close()
+
+
+def init_db(bind=None):
+    """
+    Bring the database up to SCHEMA_VERSION without touching existing data.
+
+    If the stored version already matches this is a single lookup. Otherwise
+    missing tables and indexes are created, the upgrade steps run and the new
+    version is recorded. A database with tables but no schema_version counts
+    as version 0. Runs under a cross-process lock, so workers starting at the
+    same time upgrade once. Returns the version the database was at before
+    this call (None if it was empty).
+    """
+    bind = bind or engine
+    stored = _stored_version(bind)
+    if stored == SCHEMA_VERSION:
+        return stored
+
+    with _init_lock(bind):
+        # another process may have finished the upgrade while we waited
+        stored = _stored_version(bind)
+        if stored == SCHEMA_VERSION:
+            return stored
+        if stored is not None and stored > SCHEMA_VERSION:
+            logger.warning(
+                "Database schema version %s is newer than this code (%s); leaving it alone.",
+                stored, SCHEMA_VERSION,
+            )
+            return stored
+
+        # checkfirst: only missing tables are created
+        Base.metadata.create_all(bind)
+        if stored is not None:
+            # create_all skips tables that already exist, including their new indexes
+            for table in Base.metadata.sorted_tables:
+                for idx in table.indexes:
+                    idx.create(bind, checkfirst=True)
+            steps = []
+            for version in range(stored + 1, SCHEMA_VERSION + 1):
+                if version in UPGRADES and UPGRADES[version] not in steps:
+                    steps.append(UPGRADES[version])
+            for step in steps:
+                step(bind)
+
+        db = Session(bind=bind)
+        try:
+            row = db.get(SchemaVersion, 1)
+            if row is None:
+                db.add(SchemaVersion(id=1, version=SCHEMA_VERSION))
+            else:
+                row.version = SCHEMA_VERSION
+                row.applied_at = datetime.utcnow()
+            db.commit()
+        finally:
+            db.close()
+
+    logger.info("Database schema upgraded from %s to %s.", stored, SCHEMA_VERSION)
+    return stored
+
 
 def index():
     """Drop all tables, recreate them, and seed test data."""
     # 1) DROP ALL TABLES (for testing only)
-    ratings.Base.metadata.drop_all(engine)
-    order_details.Base.metadata.drop_all(engine)
-    orders.Base.metadata.drop_all(engine)
-    recipes.Base.metadata.drop_all(engine)
-    sandwiches.Base.metadata.drop_all(engine)
-    promotions.Base.metadata.drop_all(engine)
-    resources.Base.metadata.drop_all(engine)
-
-    # 2) CREATE ALL TABLES (in FK-friendly order)
-    resources.Base.metadata.create_all(engine)
-    sandwiches.Base.metadata.create_all(engine)
-    recipes.Base.metadata.create_all(engine)
-    promotions.Base.metadata.create_all(engine)
-    orders.Base.metadata.create_all(engine)
-    order_details.Base.metadata.create_all(engine)
-    ratings.Base.metadata.create_all(engine)
-    tags.Base.metadata.create_all(engine)
+    Base.metadata.drop_all(engine)
+
+    # 2) CREATE ALL TABLES (FK order is resolved by SQLAlchemy)
+    init_db()
 
     # 3) SEED DATA
     seed_initial_data()
@@ -282,5 +421,8 @@ def seed_initial_data():
             db.commit()
             for t in initial_tags:
                 db.refresh(t)
+
+        # ---------- ROLLUPS (derived from the rows above) ----------
+        _backfill_rollups(engine)
     finally:
         db.close()
\ No newline at end of file
@@ -1,15 +1,21 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DECIMAL, DATETIME
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, DECIMAL, DATETIME
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..dependencies.database import Base
 
 class OrderDetail(Base):
     __tablename__ = "order_details"
+    __table_args__ = (
+        # details of one order (reads, totals verification)
+        Index("ix_order_details_order_id", "order_id"),
+        # per-sandwich sales analytics
+        Index("ix_order_details_sandwich_id", "sandwich_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"))
     sandwich_id = Column(Integer, ForeignKey("sandwiches.id"))
-    amount = Column(Integer, index=True, nullable=False)
+    amount = Column(Integer, nullable=False)
 
     sandwich = relationship("Sandwich", back_populates="order_details")
     order = relationship("Order", back_populates="order_details")
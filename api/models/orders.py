@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DECIMAL, DATETIME, Enum, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, DECIMAL, DATETIME, Enum, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..dependencies.database import Base
@@ -29,7 +29,14 @@ class PaymentStatus(enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
-    __table_args__ = (UniqueConstraint('tracking_number', name='uq_orders_tracking'),)
+    __table_args__ = (
+        UniqueConstraint('tracking_number', name='uq_orders_tracking'),
+        # date-range listing, keyset pagination and export order by (order_date, id)
+        Index("ix_orders_order_date_id", "order_date", "id"),
+        # paid revenue by date (rollup backfill, revenue time series)
+        Index("ix_orders_payment_status_order_date", "payment_status", "order_date"),
+        Index("ix_orders_customer_phone", "customer_phone"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     tracking_number = Column(
@@ -1,10 +1,19 @@
-from sqlalchemy import Column, Integer, String, DATETIME, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, DATETIME, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..dependencies.database import Base
 
 class Rating(Base):
     __tablename__ = "ratings"
+    __table_args__ = (
+        # low-star complaints
+        Index("ix_ratings_stars", "stars"),
+        Index("ix_ratings_sandwich_id", "sandwich_id"),
+        # complaints date filter
+        Index("ix_ratings_created_at", "created_at"),
+        # complaints keyword search; other databases fall back to LIKE
+        Index("ix_ratings_reason_fulltext", "reason", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     sandwich_id = Column(Integer, ForeignKey("sandwiches.id"))
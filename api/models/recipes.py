@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DECIMAL, DATETIME
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, DECIMAL, DATETIME
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..dependencies.database import Base
@@ -6,11 +6,13 @@ from ..dependencies.database import Base
 
 class Recipe(Base):
     __tablename__ = "recipes"
+    # ingredient lookup for the sandwiches on an order
+    __table_args__ = (Index("ix_recipes_sandwich_id", "sandwich_id"),)
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     sandwich_id = Column(Integer, ForeignKey("sandwiches.id"))
     resource_id = Column(Integer, ForeignKey("resources.id"))
-    amount = Column(Integer, index=True, nullable=False, server_default='0.0')
+    amount = Column(Integer, nullable=False, server_default='0.0')
 
     sandwich = relationship("Sandwich", back_populates="recipes")
     resource = relationship("Resource", back_populates="recipes")
\ No newline at end of file
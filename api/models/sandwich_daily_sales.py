@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DATE, Enum, ForeignKey, Integer
+from ..dependencies.database import Base
+from .orders import OrderStatus
+
+
+class SandwichDailySales(Base):
+    """
+    Quantity of each sandwich ordered per calendar day (UTC, by order_date)
+    and order status, kept current by the order and order detail write
+    paths so popularity reports never scan order_details.
+    """
+    __tablename__ = "sandwich_daily_sales"
+
+    day = Column(DATE, primary_key=True)
+    sandwich_id = Column(Integer, ForeignKey("sandwiches.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(Enum(OrderStatus), primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
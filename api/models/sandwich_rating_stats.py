@@ -0,0 +1,30 @@
+from sqlalchemy import Column, ForeignKey, Integer
+from sqlalchemy.orm import relationship
+from ..dependencies.database import Base
+
+
+class SandwichRatingStats(Base):
+    """
+    Rating count, star sum and star histogram per sandwich, kept current by
+    the rating write paths so averages never scan ratings.
+    """
+    __tablename__ = "sandwich_rating_stats"
+
+    sandwich_id = Column(Integer, ForeignKey("sandwiches.id", ondelete="CASCADE"), primary_key=True)
+    rating_count = Column(Integer, nullable=False, default=0)
+    star_sum = Column(Integer, nullable=False, default=0)
+    stars_1 = Column(Integer, nullable=False, default=0)
+    stars_2 = Column(Integer, nullable=False, default=0)
+    stars_3 = Column(Integer, nullable=False, default=0)
+    stars_4 = Column(Integer, nullable=False, default=0)
+    stars_5 = Column(Integer, nullable=False, default=0)
+
+    sandwich = relationship("Sandwich", back_populates="rating_stats")
+
+    @property
+    def average(self) -> float | None:
+        return round(self.star_sum / self.rating_count, 2) if self.rating_count else None
+
+    @property
+    def histogram(self) -> dict[int, int]:
+        return {stars: getattr(self, f"stars_{stars}") for stars in range(1, 6)}
@@ -21,6 +21,9 @@ class Sandwich(Base):
         cascade="all, delete-orphan",
     )
 
+    # rating aggregates; load explicitly (selectinload) where they are shown
+    rating_stats = relationship("SandwichRatingStats", back_populates="sandwich", uselist=False)
+
     @property
     def tag_ids(self) -> list[int]:
         # sandwich.sandwich_tags is a list of SandwichTag objects
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, DATETIME
+from datetime import datetime
+from ..dependencies.database import Base
+
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    # single row, id is always 1
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+    applied_at = Column(DATETIME, nullable=False, default=datetime.utcnow)
@@ -1,9 +1,12 @@
-from datetime import date
-from fastapi import APIRouter, Depends, Query
+from datetime import date, datetime
+from typing import Literal
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 
 from ..dependencies.database import get_db
+from ..dependencies.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 from ..controllers import analytics as controller
+from ..schemas import ratings as rating_schema
 
 router = APIRouter(
     tags=["Staff Analytics"],
@@ -12,21 +15,95 @@ router = APIRouter(
 
 
 @router.get("/least-popular-dishes")
-def least_popular_dishes(limit: int = 5, db: Session = Depends(get_db)):
+def least_popular_dishes(
+    limit: int = 5,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    order_status: list[str] | None = Query(None, alias="status"),
+    db: Session = Depends(get_db),
+):
+    """
+    Identify dishes that are less popular (ordered least often), optionally
+    within a date range (inclusive) and for the given order statuses.
+    Example: /staff/least-popular-dishes?limit=5&start_date=2025-01-01&status=completed
+    """
+    return controller.get_least_popular_dishes(db, limit, start_date, end_date, order_status)
+
+
+@router.get("/most-popular-dishes")
+def most_popular_dishes(
+    limit: int = 5,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    order_status: list[str] | None = Query(None, alias="status"),
+    db: Session = Depends(get_db),
+):
+    """
+    Best-selling dishes, optionally within a date range (inclusive) and for
+    the given order statuses.
+    Example: /staff/most-popular-dishes?limit=5&status=completed&status=out_for_delivery
+    """
+    return controller.get_most_popular_dishes(db, limit, start_date, end_date, order_status)
+
+
+@router.get("/capacity")
+def capacity(db: Session = Depends(get_db)):
     """
-    Identify dishes that are less popular (ordered least often).
-    Example: /staff/least-popular-dishes?limit=5
+    Maximum number of each sandwich that current inventory can make, scarcest first.
+    Example: /staff/capacity
     """
-    return controller.get_least_popular_dishes(db, limit)
+    return controller.get_capacity(db)
+
+
+@router.get("/ratings", response_model=list[rating_schema.SandwichRatingSummary])
+def rating_summaries(sandwich_id: int | None = None, db: Session = Depends(get_db)):
+    """
+    Rating count, average and star histogram per sandwich, lowest average first.
+    Example: /staff/ratings?sandwich_id=3
+    """
+    return controller.get_rating_summaries(db, sandwich_id)
 
 
 @router.get("/complaints")
-def complaints(max_stars: int = 2, db: Session = Depends(get_db)):
+def complaints(
+    response: Response,
+    max_stars: int = 2,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    sandwich_id: int | None = None,
+    start_date: datetime | None = Query(None, description="Reviews created at or after (YYYY-MM-DD)."),
+    end_date: datetime | None = Query(None, description="Reviews created before (YYYY-MM-DD)."),
+    q: str | None = Query(None, max_length=200, description="Words that must all appear in the reason."),
+    db: Session = Depends(get_db),
+):
+    """
+    View low-star reviews (<= max_stars) and their reasons, one page at a time.
+    Filter by sandwich, date range and keywords in the reason.
+    The next page's cursor is returned in the X-Next-Cursor header.
+    Example: /staff/complaints?max_stars=2&limit=50&sandwich_id=3&q=soggy bread
+    """
+    items, next_cursor = controller.get_complaints(
+        db, max_stars, limit=limit, cursor=cursor,
+        sandwich_id=sandwich_id, start_date=start_date, end_date=end_date, search=q,
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+
+@router.get("/revenue/series")
+def revenue_series(
+    start_date: date,
+    end_date: date,
+    bucket: Literal["hour", "day", "week", "month"] = Query("day"),
+    db: Session = Depends(get_db),
+):
     """
-    View low-star reviews (<= max_stars) and their reasons.
-    Example: /staff/complaints?max_stars=2
+    Paid revenue, order count and average ticket per hour, day, week or
+    month between two dates (inclusive); empty buckets are returned as zeros.
+    Example: /staff/revenue/series?start_date=2025-11-01&end_date=2025-11-30&bucket=day
     """
-    return controller.get_complaints(db, max_stars)
+    return controller.get_revenue_series(db, start_date, end_date, bucket)
 
 
 @router.get("/revenue")
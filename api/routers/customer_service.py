@@ -1,8 +1,10 @@
 # api/routers/customer_service.py
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..dependencies.database import get_db
+from ..dependencies.database import get_async_db
+from ..dependencies.etag import etag_matches
 from ..schemas import orders as order_schema
 from ..schemas import sandwiches as sandwich_schema
 from ..controllers import orders as orders_controller
@@ -14,9 +16,35 @@ router = APIRouter(
 )
 
 @router.get("/orders/track/{tracking_number}", response_model=order_schema.Order)
-def track_order(tracking_number: str, db: Session = Depends(get_db)):
-    return orders_controller.read_by_tracking_number(db=db, tracking_number=tracking_number)
+async def track_order(
+    tracking_number: str,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Order status by tracking number. Send the returned ETag back in
+    If-None-Match to get 304 Not Modified while nothing has changed.
+    """
+    body, etag = await orders_controller.track_async(db=db, tracking_number=tracking_number)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/orders/track/{tracking_number}/events")
+async def track_order_events(tracking_number: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Live order status as Server-Sent Events: a `snapshot` event, then a
+    `status` event on every transition until the order is completed or canceled.
+    Example: new EventSource("/customer/orders/track/TRK-3F9A1C2D/events")
+    """
+    events = await orders_controller.status_events(db, tracking_number, request.is_disconnected)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.get("/menu/search", response_model=list[sandwich_schema.Sandwich])
-def search_menu(tag: str | None = None, db: Session = Depends(get_db)):
-    return sandwiches_controller.search_by_tag(db=db, tag_name=tag)
+async def search_menu(tag: str | None = None, db: AsyncSession = Depends(get_async_db)):
+    return await sandwiches_controller.search_by_tag_async(db=db, tag_name=tag)
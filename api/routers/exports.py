@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..controllers import exports as controller
+from ..dependencies.database import get_db
+
+router = APIRouter(
+    tags=["Exports"],
+    prefix="/exports",
+)
+
+
+@router.get("/{table}")
+def export_table(
+    table: Literal["orders", "order_details", "ratings", "sandwiches"],
+    start_date: datetime | None = Query(None, description="Start datetime (inclusive)."),
+    end_date: datetime | None = Query(None, description="End datetime (inclusive)."),
+    format: Literal["arrow", "parquet"] = Query("parquet"),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream one table as an Arrow IPC stream or a Parquet file for analytics.
+    Orders and their lines are filtered by order_date, ratings by
+    created_at; sandwiches are always exported whole.
+    Example: /exports/orders?start_date=2025-01-01&end_date=2025-03-31&format=parquet
+    """
+    extension, media_type = controller.FORMATS[format]
+    return StreamingResponse(
+        # stream on the request's database, on a connection of its own
+        controller.export_table(table, start_date, end_date, fmt=format, bind=db.get_bind()),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{table}.{extension}"'},
+    )
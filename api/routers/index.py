@@ -1,4 +1,4 @@
-from . import orders, order_details, promotions, ratings, sandwiches, resources, recipes, tags, analytics, customer_service
+from . import orders, order_details, promotions, ratings, sandwiches, resources, recipes, tags, analytics, customer_service, system, metrics, exports
 
 def load_routes(app):
     app.include_router(orders.router)
@@ -11,4 +11,7 @@ def load_routes(app):
     app.include_router(tags.router)
     app.include_router(analytics.router)
     app.include_router(customer_service.router)
+    app.include_router(system.router)
+    app.include_router(metrics.router)
+    app.include_router(exports.router)
 
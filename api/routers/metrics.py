@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Response
+
+from ..dependencies import metrics
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """
+    Prometheus scrape endpoint.
+    Example: /metrics
+    """
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
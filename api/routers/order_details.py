@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session
 from ..controllers import order_details as controller
 from ..schemas import order_details as schema
 from ..dependencies.database import engine, get_db
+from ..dependencies.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from ..dependencies.serialization import page_response
 
 router = APIRouter(
     tags=['Order Details'],
@@ -21,9 +23,11 @@ def read_all(
         default=None,
         description="Optional order id to filter order details",
     ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size."),
+    cursor: str | None = Query(None, description=f"Value of {NEXT_CURSOR_HEADER} from the previous page."),
     db: Session = Depends(get_db),
 ):
-    return controller.read(db=db, order_id=order_id)
+    return page_response(*controller.read(db=db, order_id=order_id, limit=limit, cursor=cursor))
 
 
 @router.get("/{item_id}", response_model=schema.OrderDetail)
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Depends, FastAPI, status, Response, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+from typing import Literal
 from ..controllers import orders as controller
 from ..schemas import orders as schema
-from ..dependencies.database import engine, get_db
+from ..dependencies.database import engine, get_async_db, get_db
+from ..dependencies.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from ..dependencies.serialization import page_response
 
 router = APIRouter(
     tags=['Orders'],
@@ -16,6 +21,28 @@ def create(request: schema.OrderCreate, db: Session = Depends(get_db)):
     return controller.create(db=db, request=request)
 
 
+@router.post("/checkout", response_model=schema.OrderWithDetails)
+def checkout(request: schema.OrderWithDetailsCreate, db: Session = Depends(get_db)):
+    """
+    Submit an order and all of its line items in one request.
+    Inventory, details and totals are handled in a single transaction.
+    """
+    return controller.create_with_details(db=db, request=request)
+
+
+@router.post("/totals/verify")
+def verify_totals(
+    repair: bool = Query(False, description="Rewrite totals that do not match a full recompute."),
+    batch_size: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    """
+    Recompute every order's totals in batches and report (or repair) drift.
+    Example: /orders/totals/verify?repair=true
+    """
+    return controller.verify_all_order_totals(db, batch_size=batch_size, repair=repair)
+
+
 @router.get("/", response_model=list[schema.Order])
 def read(
     db: Session = Depends(get_db),
@@ -27,13 +54,35 @@ def read(
         None,
         description="Optional end datetime (YYYY-MM-DD) for filtering orders (exclusive). ",
     ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size."),
+    cursor: str | None = Query(None, description=f"Value of {NEXT_CURSOR_HEADER} from the previous page."),
+):
+    return page_response(*controller.read(db, start_date, end_date, limit=limit, cursor=cursor))
+
+
+@router.get("/export")
+def export(
+    start_date: datetime | None = Query(None, description="Start datetime (inclusive)."),
+    end_date: datetime | None = Query(None, description="End datetime (inclusive)."),
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    db: Session = Depends(get_db),
 ):
-    return controller.read(db, start_date, end_date)
+    """
+    Stream every order in the date range as NDJSON or CSV.
+    Example: /orders/export?start_date=2025-01-01&end_date=2025-03-31&format=csv
+    """
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        # stream on the request's database, on a connection of its own
+        controller.export(start_date, end_date, fmt=format, bind=db.get_bind()),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="orders.{format}"'},
+    )
 
 
 @router.get("/{item_id}", response_model=schema.Order)
-def read_one(item_id: int, db: Session = Depends(get_db)):
-    return controller.read_one(db, item_id=item_id)
+async def read_one(item_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await controller.read_one_async(db, item_id=item_id)
 
 
 @router.put("/{item_id}", response_model=schema.Order)
@@ -14,6 +14,10 @@ def create(request: schema.PromotionCreate, db: Session = Depends(get_db)):
 def read(db: Session = Depends(get_db)):
     return controller.read(db)
 
+@router.get("/code/{code}", response_model=schema.Promotion)
+def read_active_by_code(code: str, db: Session = Depends(get_db)):
+    return controller.read_active_by_code(db, code=code)
+
 @router.get("/{item_id}", response_model=schema.Promotion)
 def read_one(item_id: int, db: Session = Depends(get_db)):
     return controller.read_one(db, item_id=item_id)
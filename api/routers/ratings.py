@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from ..controllers import ratings as controller
 from ..schemas import ratings as schema
 from ..dependencies.database import get_db
+from ..dependencies.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..dependencies.serialization import page_response
 
 router = APIRouter(tags=['Ratings'], prefix="/ratings")
 
@@ -11,8 +13,12 @@ def create(request: schema.RatingCreate, db: Session = Depends(get_db)):
     return controller.create(db=db, request=request)
 
 @router.get("/", response_model=list[schema.Rating])
-def read(db: Session = Depends(get_db)):
-    return controller.read(db)
+def read(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+):
+    return page_response(*controller.read(db, limit=limit, cursor=cursor))
 
 @router.get("/{item_id}", response_model=schema.Rating)
 def read_one(item_id: int, db: Session = Depends(get_db)):
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..controllers import sandwiches as controller
 from ..schemas import sandwiches as schema
-from ..dependencies.database import get_db
+from ..dependencies.database import get_async_db, get_db
 
 router = APIRouter(tags=['Sandwiches'], prefix="/sandwiches")
 
@@ -11,8 +12,8 @@ def create(request: schema.SandwichCreate, db: Session = Depends(get_db)):
     return controller.create(db=db, request=request)
 
 @router.get("/", response_model=list[schema.Sandwich])
-def read(db: Session = Depends(get_db)):
-    return controller.read(db)
+async def read(db: AsyncSession = Depends(get_async_db)):
+    return await controller.read_async(db)
 
 @router.get("/{item_id}", response_model=schema.Sandwich)
 def read_one(item_id: int, db: Session = Depends(get_db)):
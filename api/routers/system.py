@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+
+from ..controllers import system as controller
+
+router = APIRouter(
+    tags=["Staff System"],
+    prefix="/staff",
+)
+
+
+@router.get("/db-pool")
+def db_pool():
+    """
+    Live database connection pool statistics.
+    Example: /staff/db-pool
+    """
+    return controller.get_db_pool_stats()
+
+
+@router.get("/cache")
+def cache_stats():
+    """
+    Hit/miss counters for the in-process caches of this worker.
+    Example: /staff/cache
+    """
+    return controller.get_cache_stats()
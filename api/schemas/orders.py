@@ -20,6 +20,19 @@ class OrderCreate(OrderBase):
     pass
 
 
+class OrderLineCreate(BaseModel):
+    """One line item of an order submitted in a single request."""
+    sandwich_id: int
+    amount: int
+
+
+class OrderWithDetailsCreate(OrderCreate):
+    """
+    Input for submitting an order and all of its line items at once.
+    """
+    details: List[OrderLineCreate]
+
+
 class OrderUpdate(BaseModel):
     """
     Input for updating an order (staff side).
@@ -51,3 +64,13 @@ class Order(OrderBase):
 
     class ConfigDict:
         from_attributes = True
+
+
+class OrderWithDetails(Order):
+    """
+    Order returned together with its line items.
+    """
+    order_details: List[OrderDetail] = []
+
+    class ConfigDict:
+        from_attributes = True
@@ -19,4 +19,16 @@ class Rating(RatingBase):
     id: int
     created_at: Optional[datetime] = None
     class ConfigDict:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class RatingSummary(BaseModel):
+    count: int
+    average: Optional[float] = None
+    # stars (1-5) -> number of ratings
+    histogram: dict[int, int]
+
+
+class SandwichRatingSummary(RatingSummary):
+    sandwich_id: int
+    sandwich_name: Optional[str] = None
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel
+from .ratings import RatingSummary
 
 
 class SandwichBase(BaseModel):
@@ -23,6 +24,10 @@ class SandwichUpdate(BaseModel):
 
 class Sandwich(SandwichBase):
     id: int
+    # how many current stock can make; filled on menu reads, None without a recipe
+    max_makeable: Optional[int] = None
+    # rating count, average and histogram; filled on menu and single reads
+    rating: Optional[RatingSummary] = None
 
     class ConfigDict:
         from_attributes = True
\ No newline at end of file
@@ -0,0 +1,168 @@
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..dependencies.cache import invalidate_all
+from ..dependencies.database import Base, get_async_db, get_db
+from ..dependencies.instrumentation import instrument_engine
+from ..main import app
+from ..models import model_loader  # noqa: F401  (registers every model on Base)
+from ..models.order_details import OrderDetail
+from ..models.orders import Order, OrderStatus, OrderType, PaymentStatus
+from ..models.ratings import Rating
+from ..models.recipes import Recipe
+from ..models.resources import Resource
+from ..models.sandwiches import Sandwich
+
+
+def populate(db, orders: int = 2000, sandwiches: int = 20, ratings: int = 2000, seed: int = 7):
+    """Bulk-insert a deterministic dataset big enough for realistic query plans."""
+    rng = random.Random(seed)
+    now = datetime(2025, 6, 1)
+
+    db.execute(insert(Resource), [{"item": f"Resource {i}", "amount": 10_000} for i in range(1, 11)])
+    db.execute(insert(Sandwich), [
+        {"sandwich_name": f"Sandwich {i}", "price": rng.choice([5, 6.5, 7, 8.5, 9])}
+        for i in range(1, sandwiches + 1)
+    ])
+    db.execute(insert(Recipe), [
+        {"sandwich_id": s, "resource_id": r, "amount": rng.randint(1, 2)}
+        for s in range(1, sandwiches + 1)
+        for r in rng.sample(range(1, 11), 3)
+    ])
+    db.execute(insert(Order), [
+        {
+            "tracking_number": f"TRK-{i:08d}",
+            "customer_name": f"Customer {i}",
+            "customer_phone": f"555-{i:07d}",
+            "delivery_address": f"{i} Main St",
+            "order_type": rng.choice(list(OrderType)),
+            "status": rng.choice(list(OrderStatus)),
+            "payment_status": rng.choice(list(PaymentStatus)),
+            "order_date": now - timedelta(minutes=17 * i),
+            "subtotal": 10, "discount": 0, "tax": 0.75, "total": 10.75,
+        }
+        for i in range(1, orders + 1)
+    ])
+    db.execute(insert(OrderDetail), [
+        {"order_id": o, "sandwich_id": rng.randint(1, sandwiches), "amount": rng.randint(1, 3)}
+        for o in range(1, orders + 1)
+        for _ in range(rng.randint(1, 4))
+    ])
+    db.execute(insert(Rating), [
+        {
+            "sandwich_id": rng.randint(1, sandwiches),
+            "stars": rng.randint(1, 5),
+            "reason": rng.choice(["soggy bread", "too dry", "great", "fresh and tasty", "cold"]),
+            "created_at": now - timedelta(minutes=29 * i),
+        }
+        for i in range(ratings)
+    ])
+    db.commit()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    instrument_engine(engine)
+    # in-process caches outlive the per-test database
+    invalidate_all()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_engine(engine, tmp_path):
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    instrument_engine(async_engine.sync_engine)
+    yield async_engine
+    async_engine.sync_engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def seeded_db(db):
+    populate(db)
+    return db
+
+
+class QueryRecorder:
+    """Collects (sql, parameters) for every statement run on the given engines."""
+
+    def __init__(self, *engines):
+        self.engines = engines
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture
+def record_queries(engine, async_engine):
+    return lambda: QueryRecorder(engine, async_engine.sync_engine)
+
+
+@pytest.fixture
+def client(engine, async_engine):
+    """
+    TestClient for the full app with both the sync and async session
+    dependencies pointed at the test database.
+    """
+    SyncSession = sessionmaker(bind=engine, autoflush=False)
+    AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_test_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_test_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_async_db] = get_test_async_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+        invalidate_all()
+
+
+@contextmanager
+def assert_max_queries(recorder_factory, limit: int):
+    """Fail if the block issues more than `limit` SQL statements."""
+    with recorder_factory() as recorder:
+        yield recorder
+    assert recorder.count <= limit, (
+        f"expected at most {limit} queries, got {recorder.count}:\n"
+        + "\n".join(sql for sql, _ in recorder.statements)
+    )
@@ -0,0 +1,54 @@
+"""In-memory bill of materials and the max-makeable numbers built on it."""
+from ..controllers import recipes, resources
+from ..models.recipes import Recipe
+from ..models.resources import Resource
+from .conftest import assert_max_queries
+
+
+def _brute_force_capacity(db):
+    stock = {r.id: r.amount for r in db.query(Resource)}
+    result = {}
+    for recipe in db.query(Recipe):
+        can = stock[recipe.resource_id] // recipe.amount
+        result[recipe.sandwich_id] = min(result.get(recipe.sandwich_id, can), can)
+    return result
+
+
+def test_cart_ingredients_come_from_memory(seeded_db, record_queries):
+    recipes.bill_of_materials(seeded_db)
+    with assert_max_queries(record_queries, 0):
+        required = resources.required_ingredients(seeded_db, [(1, 2), (3, 1), (1, 1)])
+
+    expected = {}
+    for recipe in seeded_db.query(Recipe).filter(Recipe.sandwich_id.in_([1, 3])):
+        qty = 3 if recipe.sandwich_id == 1 else 1
+        expected[recipe.resource_id] = expected.get(recipe.resource_id, 0) + recipe.amount * qty
+    assert required == expected
+
+
+def test_capacity_matches_stock(seeded_db):
+    seeded_db.query(Resource).filter(Resource.id == 2).update({"amount": 7})
+    seeded_db.commit()
+    assert resources.capacity(seeded_db) == _brute_force_capacity(seeded_db)
+
+
+def test_recipe_and_stock_writes_refresh_capacity(seeded_db, client):
+    before = {row["sandwich_id"]: row["max_makeable"] for row in client.get("/staff/capacity").json()}
+
+    client.put("/resources/1", json={"amount": 0})
+    after = {row["sandwich_id"]: row["max_makeable"] for row in client.get("/staff/capacity").json()}
+    users = {r.sandwich_id for r in seeded_db.query(Recipe).filter(Recipe.resource_id == 1)}
+    assert users and all(after[sid] == 0 for sid in users)
+    assert all(after[sid] == before[sid] for sid in after if sid not in users)
+
+    unused = next(rid for rid in range(1, 11) if rid not in {r.resource_id for r in seeded_db.query(Recipe).filter(Recipe.sandwich_id == 20)})
+    client.put(f"/resources/{unused}", json={"amount": 3})
+    client.post("/recipes/", json={"sandwich_id": 20, "resource_id": unused, "amount": 2})
+    rows = client.get("/staff/capacity").json()
+    assert next(row for row in rows if row["sandwich_id"] == 20)["max_makeable"] == 1
+    assert [row["max_makeable"] for row in rows] == sorted(row["max_makeable"] for row in rows)
+
+
+def test_menu_shows_max_makeable(seeded_db, client):
+    menu = {item["id"]: item["max_makeable"] for item in client.get("/sandwiches/").json()}
+    assert menu == _brute_force_capacity(seeded_db)
@@ -0,0 +1,76 @@
+"""POST /orders/checkout: the order and all its lines, or nothing."""
+from decimal import Decimal
+
+import pytest
+
+from ..controllers import orders
+from ..models.order_details import OrderDetail
+from ..models.orders import Order
+from ..models.recipes import Recipe
+from ..models.resources import Resource
+from ..models.sandwiches import Sandwich
+
+
+def _body(details, **extra):
+    return {
+        "customer_name": "Checkout", "customer_phone": "555-0123456", "delivery_address": "1 Main St",
+        "order_type": "takeout", "details": details, **extra,
+    }
+
+
+def _counts(db):
+    db.expire_all()
+    return db.query(Order).count(), db.query(OrderDetail).count(), dict(db.query(Resource.id, Resource.amount))
+
+
+def test_short_ingredient_writes_nothing(seeded_db, client):
+    resource_id, qty = seeded_db.query(Recipe.resource_id, Recipe.amount).filter(Recipe.sandwich_id == 4).first()
+    seeded_db.query(Resource).filter(Resource.id == resource_id).update({"amount": qty})
+    seeded_db.commit()
+    before = _counts(seeded_db)
+
+    response = client.post("/orders/checkout", json=_body([
+        {"sandwich_id": 1, "amount": 1},
+        {"sandwich_id": 4, "amount": 2},
+    ]))
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Insufficient ingredients: ")
+    assert _counts(seeded_db) == before
+
+
+@pytest.mark.parametrize("details, detail", [
+    ([{"sandwich_id": 1, "amount": 1}, {"sandwich_id": 999, "amount": 1}], "Unknown sandwich id(s): [999]"),
+    ([], "An order needs at least one line item."),
+    ([{"sandwich_id": 1, "amount": 0}], "Line item amounts must be positive."),
+    ([{"sandwich_id": 1, "amount": 2}, {"sandwich_id": 2, "amount": -1}], "Line item amounts must be positive."),
+])
+def test_invalid_carts_are_rejected(details, detail, seeded_db, client):
+    before = _counts(seeded_db)
+
+    response = client.post("/orders/checkout", json=_body(details))
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+    assert _counts(seeded_db) == before
+
+
+@pytest.mark.parametrize("promo", [
+    None,
+    {"code": "TENOFF", "discount_type": "percent", "discount_value": 10},
+    {"code": "TWO", "discount_type": "amount", "discount_value": 2},
+])
+def test_totals_match_a_full_recompute(promo, seeded_db, client):
+    orders.verify_all_order_totals(seeded_db, repair=True)
+    extra = {"promo_id": client.post("/promotions/", json=promo).json()["id"]} if promo else {}
+    lines = [{"sandwich_id": 1, "amount": 2}, {"sandwich_id": 7, "amount": 1}, {"sandwich_id": 1, "amount": 1}]
+
+    response = client.post("/orders/checkout", json=_body(lines, **extra))
+
+    assert response.status_code == 200, response.text
+    order = response.json()
+    assert len(order["order_details"]) == 3
+    prices = dict(seeded_db.query(Sandwich.id, Sandwich.price))
+    assert Decimal(str(order["subtotal"])) == 3 * prices[1] + prices[7]
+    assert order["discount"] > 0 if promo else order["discount"] == 0
+    assert orders.verify_all_order_totals(seeded_db)["mismatched"] == 0
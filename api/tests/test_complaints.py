@@ -0,0 +1,50 @@
+"""Filters, keyword search and paging on /staff/complaints."""
+from datetime import datetime
+
+from sqlalchemy import inspect
+
+from ..models.ratings import Rating
+from ..dependencies.pagination import NEXT_CURSOR_HEADER
+
+
+def _all_pages(client, params):
+    ids, cursor = [], None
+    while True:
+        response = client.get("/staff/complaints", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        ids += [row["rating_id"] for row in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return ids
+
+
+def _expected(db, max_stars=2, sandwich_id=None, start=None, end=None, words=()):
+    return sorted(
+        r.id for r in db.query(Rating)
+        if r.stars <= max_stars
+        and (sandwich_id is None or r.sandwich_id == sandwich_id)
+        and (start is None or r.created_at >= start)
+        and (end is None or r.created_at < end)
+        and all(w in r.reason for w in words)
+    )
+
+
+def test_filters_combine_across_pages(seeded_db, client):
+    params = {"max_stars": 3, "sandwich_id": 4, "start_date": "2025-04-01", "end_date": "2025-05-15", "limit": 7}
+    ids = _all_pages(client, params)
+    assert ids
+    assert ids == _expected(seeded_db, 3, 4, datetime(2025, 4, 1), datetime(2025, 5, 15))
+
+
+def test_keyword_search_requires_every_word(seeded_db, client):
+    assert _all_pages(client, {"q": "Soggy  BREAD!", "limit": 50}) == _expected(seeded_db, words=("soggy", "bread"))
+    assert _all_pages(client, {"q": "dry", "max_stars": 5, "limit": 200}) == _expected(seeded_db, 5, words=("dry",))
+    assert _all_pages(client, {"q": "100%_", "limit": 50}) == []
+    # no words at all means no keyword filter
+    assert _all_pages(client, {"q": " _ %% ", "limit": 500}) == _expected(seeded_db)
+
+
+def test_fulltext_index_is_mysql_only(engine):
+    names = {idx["name"] for idx in inspect(engine).get_indexes("ratings")}
+    assert "ix_ratings_created_at" in names
+    assert "ix_ratings_reason_fulltext" not in names
@@ -0,0 +1,47 @@
+"""Order and line writes keep daily_revenue equal to a fresh rebuild."""
+from ..controllers import analytics, orders
+from ..models.daily_revenue import DailyRevenue
+from ..models.orders import Order, PaymentStatus
+
+
+def _rollup(db):
+    db.expire_all()
+    return {
+        day: (total, count)
+        for day, total, count in db.query(DailyRevenue.day, DailyRevenue.total_revenue, DailyRevenue.order_count)
+        if total or count
+    }
+
+
+def _assert_matches_rebuild(db):
+    incremental = _rollup(db)
+    analytics.rebuild_daily_revenue(db)
+    assert incremental == _rollup(db)
+
+
+def test_writes_keep_rollup_exact(seeded_db, client):
+    db = seeded_db
+    orders.verify_all_order_totals(db, repair=True)
+    analytics.rebuild_daily_revenue(db)
+    order_id = db.query(Order.id).filter(Order.payment_status == PaymentStatus.pending).first().id
+    day = db.get(Order, order_id).order_date.date()
+    before = _rollup(db).get(day, (0, 0))
+
+    client.put(f"/orders/{order_id}", json={"payment_status": "paid"})
+    assert _rollup(db)[day][1] == before[1] + 1
+    _assert_matches_rebuild(db)
+
+    line = client.post("/orderdetails/", json={"order_id": order_id, "sandwich_id": 1, "amount": 2}).json()
+    _assert_matches_rebuild(db)
+    client.put(f"/orderdetails/{line['id']}", json={"sandwich_id": 2, "amount": 3})
+    _assert_matches_rebuild(db)
+    client.delete(f"/orderdetails/{line['id']}")
+    _assert_matches_rebuild(db)
+
+    client.put(f"/orders/{order_id}", json={"payment_status": "failed"})
+    assert _rollup(db).get(day, (0, 0)) == before
+    _assert_matches_rebuild(db)
+
+    paid_id = db.query(Order.id).filter(Order.payment_status == PaymentStatus.paid).first().id
+    assert client.delete(f"/orders/{paid_id}").status_code == 204
+    _assert_matches_rebuild(db)
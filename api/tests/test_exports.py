@@ -0,0 +1,83 @@
+"""Arrow / Parquet exports of the order data."""
+import io
+import sys
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from ..controllers import exports
+from ..models.order_details import OrderDetail
+from ..models.orders import Order
+from ..models.ratings import Rating
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+START, END = datetime(2025, 5, 1), datetime(2025, 5, 20)
+
+
+def _read(table, fmt, engine, **kwargs):
+    body = b"".join(exports.export_table(table, START, END, fmt, bind=engine, **kwargs))
+    if fmt == "parquet":
+        return pq.read_table(io.BytesIO(body))
+    return pa.ipc.open_stream(body).read_all()
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+def test_tables_match_database(fmt, seeded_db, engine):
+    orders = (
+        seeded_db.query(Order)
+        .filter(Order.order_date >= START, Order.order_date <= END)
+        .order_by(Order.order_date, Order.id)
+        .all()
+    )
+    assert orders, "seed data has no orders in the range"
+
+    exported = _read("orders", fmt, engine, batch_size=7).to_pylist()
+    assert [row["id"] for row in exported] == [o.id for o in orders]
+    assert exported[0]["status"] == orders[0].status.value
+    assert exported[0]["total"] == orders[0].total
+    assert exported[0]["order_date"] == orders[0].order_date
+
+    details = _read("order_details", fmt, engine)
+    assert details.num_rows == (
+        seeded_db.query(OrderDetail).filter(OrderDetail.order_id.in_([o.id for o in orders])).count()
+    )
+    ratings = _read("ratings", fmt, engine)
+    assert ratings.num_rows == (
+        seeded_db.query(Rating).filter(Rating.created_at >= START, Rating.created_at <= END).count()
+    )
+    assert _read("sandwiches", fmt, engine).schema.field("price").type == pa.decimal128(4, 2)
+
+
+def test_route_streams_from_the_request_database(seeded_db, client):
+    response = client.get("/exports/orders", params={
+        "start_date": START.isoformat(), "end_date": END.isoformat(), "format": "arrow",
+    })
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="orders.arrow"'
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == seeded_db.query(Order).filter(Order.order_date >= START, Order.order_date <= END).count()
+    parquet = client.get("/exports/sandwiches")
+    assert pq.read_table(io.BytesIO(parquet.content)).num_rows == 20
+
+
+def test_record_batches_are_bounded(seeded_db, engine):
+    stmt = exports.TABLES["order_details"](None, None)
+    batches = list(exports.record_batches(pa, stmt, exports.arrow_schema(pa, stmt), engine, batch_size=10))
+    assert max(b.num_rows for b in batches) == 10
+    assert sum(b.num_rows for b in batches) == seeded_db.query(OrderDetail).count()
+
+
+def test_missing_pyarrow_is_reported(monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(HTTPException) as exc:
+        exports.export_table("orders")
+    assert exc.value.status_code == 501
+
+
+def test_unknown_table_or_format(client):
+    assert client.get("/exports/customers").status_code == 422
+    assert client.get("/exports/orders", params={"format": "csv"}).status_code == 422
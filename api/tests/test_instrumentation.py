@@ -0,0 +1,63 @@
+"""Per-request SQL counts and timings reach the response headers and the log."""
+import json
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from ..dependencies import instrumentation
+
+
+def _server_timing(response):
+    metric, dur, desc = response.headers["server-timing"].split(";")
+    assert metric == "db"
+    return float(dur.removeprefix("dur=")), desc
+
+
+def test_sync_route_reports_its_queries(seeded_db, client, record_queries, caplog):
+    with caplog.at_level(logging.INFO, logger="api.sql"), record_queries() as recorder:
+        response = client.get("/orderdetails/?limit=50")
+
+    assert response.status_code == 200
+    assert int(response.headers["x-db-queries"]) == recorder.count
+    dur, desc = _server_timing(response)
+    assert dur > 0 and desc == f'desc="{recorder.count} queries"'
+
+    [line] = [json.loads(r.getMessage()) for r in caplog.records if r.name == "api.sql"]
+    assert line["route"] == "/orderdetails/"
+    assert line["status"] == 200
+    assert line["db_queries"] == recorder.count
+    assert line["slowest_sql"].startswith("SELECT")
+
+
+def test_async_route_reports_its_queries(seeded_db, client):
+    response = client.get("/customer/orders/track/TRK-00000042")
+    assert response.status_code == 200
+    assert int(response.headers["x-db-queries"]) >= 1
+
+
+def test_requests_do_not_share_counters(seeded_db, client):
+    client.get("/sandwiches/")
+    cached = client.get("/sandwiches/")
+    # the menu is cached; only this request's rating lookup is counted
+    assert cached.headers["x-db-queries"] == "1"
+
+
+def test_failed_statements_leave_nothing_on_the_connection(engine):
+    stats = instrumentation.RequestSQLStats()
+    token = instrumentation._current.set(stats)
+    try:
+        with engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT * FROM no_such_table"))
+                conn.rollback()
+            conn.execute(text("SELECT 1"))
+            info = dict(conn.info)
+    finally:
+        instrumentation._current.reset(token)
+
+    assert info == {}
+    assert stats.count == 1
+    assert stats.slowest_statement == "SELECT 1"
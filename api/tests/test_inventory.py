@@ -0,0 +1,83 @@
+"""Inventory reservation: one guarded UPDATE, all or nothing."""
+import pytest
+from fastapi import HTTPException
+
+from ..controllers import recipes, resources
+from ..dependencies.config import conf
+from ..models.recipes import Recipe
+from ..models.resources import Resource
+
+
+def _stock(db):
+    db.expire_all()
+    return dict(db.query(Resource.id, Resource.amount))
+
+
+def _recipe(db, sandwich_id):
+    return dict(db.query(Recipe.resource_id, Recipe.amount).filter(Recipe.sandwich_id == sandwich_id))
+
+
+def test_reserve_decrements_every_ingredient(seeded_db, client):
+    recipe = _recipe(seeded_db, 3)
+    before = _stock(seeded_db)
+
+    response = client.post("/orderdetails/", json={"order_id": 1, "sandwich_id": 3, "amount": 2})
+
+    assert response.status_code == 200, response.text
+    after = _stock(seeded_db)
+    assert after == {rid: amount - 2 * recipe.get(rid, 0) for rid, amount in before.items()}
+
+
+def test_short_ingredient_rejects_the_whole_line(seeded_db, client):
+    recipe = _recipe(seeded_db, 3)
+    short_id, qty = next(iter(recipe.items()))
+    seeded_db.query(Resource).filter(Resource.id == short_id).update({"amount": qty})
+    seeded_db.commit()
+    item = seeded_db.get(Resource, short_id).item
+    before = _stock(seeded_db)
+
+    response = client.post("/orderdetails/", json={"order_id": 1, "sandwich_id": 3, "amount": 2})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Insufficient ingredients: {item}: required {2 * qty}, available {qty}"
+    # the other ingredients passed their guard but must not stay decremented
+    assert _stock(seeded_db) == before
+
+
+def test_every_short_ingredient_is_listed(seeded_db):
+    recipe = _recipe(seeded_db, 4)
+    seeded_db.query(Resource).filter(Resource.id.in_(recipe)).update({"amount": 0})
+    seeded_db.commit()
+
+    with pytest.raises(HTTPException) as exc:
+        resources.reserve(seeded_db, {rid: qty for rid, qty in recipe.items()})
+
+    assert exc.value.status_code == 400
+    assert exc.value.detail.startswith("Insufficient ingredients: ")
+    assert exc.value.detail.count("available 0") == len(recipe)
+
+
+def test_missing_resource_is_reported(seeded_db):
+    before = _stock(seeded_db)
+
+    with pytest.raises(HTTPException) as exc:
+        resources.reserve(seeded_db, {1: 1, 999: 1})
+
+    assert exc.value.status_code == 400
+    assert "Recipe references a missing resource." in exc.value.detail
+    assert _stock(seeded_db) == before
+
+
+def test_reservation_does_not_trust_an_old_recipe_index(seeded_db, monkeypatch):
+    recipe = _recipe(seeded_db, 3)
+    assert resources.required_ingredients(seeded_db, [(3, 1)]) == recipe
+    # another worker edits the recipe; this worker's cache is not invalidated
+    resource_id = next(iter(recipe))
+    seeded_db.query(Recipe).filter(Recipe.sandwich_id == 3, Recipe.resource_id == resource_id).update(
+        {"amount": recipe[resource_id] + 5}
+    )
+    seeded_db.commit()
+
+    assert dict(recipes.bill_of_materials(seeded_db)[3]) == recipe
+    monkeypatch.setattr(conf, "reserve_bom_max_age", 0)
+    assert resources.required_ingredients(seeded_db, [(3, 1)]) == _recipe(seeded_db, 3)
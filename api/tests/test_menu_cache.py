@@ -0,0 +1,37 @@
+"""The cached menu follows every sandwich write, including rejected ones."""
+
+
+def _menu(client):
+    return {item["id"]: item for item in client.get("/sandwiches/").json()}
+
+
+def test_rejected_tags_write_nothing(client):
+    assert _menu(client) == {}
+
+    response = client.post("/sandwiches/", json={"sandwich_name": "Club", "price": 8.5, "tag_ids": [999]})
+    assert response.status_code == 400
+    assert _menu(client) == {}
+    assert client.get("/sandwiches/1").status_code == 404
+
+    tag = client.post("/tags/", json={"name": "vegan"}).json()
+    sandwich = client.post("/sandwiches/", json={"sandwich_name": "Club", "price": 8.5,
+                                                 "tag_ids": [tag["id"]]}).json()
+    assert _menu(client)[sandwich["id"]]["tag_ids"] == [tag["id"]]
+
+    response = client.put(f"/sandwiches/{sandwich['id']}", json={"price": 9.5, "tag_ids": [tag["id"], 999]})
+    assert response.status_code == 400
+    assert client.get(f"/sandwiches/{sandwich['id']}").json()["price"] == 8.5
+    assert _menu(client)[sandwich["id"]]["price"] == 8.5
+
+
+def test_updates_reach_the_cached_menu(client):
+    tag = client.post("/tags/", json={"name": "spicy"}).json()
+    sandwich = client.post("/sandwiches/", json={"sandwich_name": "Reuben", "price": 9}).json()
+    assert _menu(client)[sandwich["id"]]["tag_ids"] == []
+
+    client.put(f"/sandwiches/{sandwich['id']}", json={"price": 9.75, "tag_ids": [tag["id"]]})
+    item = _menu(client)[sandwich["id"]]
+    assert (item["price"], item["tag_ids"]) == (9.75, [tag["id"]])
+
+    client.delete(f"/sandwiches/{sandwich['id']}")
+    assert _menu(client) == {}
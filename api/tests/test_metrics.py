@@ -0,0 +1,42 @@
+"""The /metrics endpoint exposes HTTP and domain counters."""
+from prometheus_client import REGISTRY
+
+CHECKOUT = {
+    "customer_name": "Test",
+    "customer_phone": "555-0000000",
+    "delivery_address": "1 Test St",
+    "order_type": "takeout",
+    "details": [{"sandwich_id": 1, "amount": 1}],
+}
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_requests_are_counted_by_route_template(seeded_db, client):
+    before = _sample("http_requests_total", method="GET", route="/orders/{item_id}", status="404")
+    client.get("/orders/999999")
+    client.get("/orders/888888")
+
+    assert _sample("http_requests_total", method="GET", route="/orders/{item_id}", status="404") == before + 2
+    assert _sample("http_request_errors_total", method="GET", route="/orders/{item_id}", status="404") >= 2
+    assert _sample("http_requests_in_flight", method="GET") == 0
+
+    body = client.get("/metrics").text
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/orders/{item_id}"}' in body
+
+
+def test_domain_counters(seeded_db, client):
+    created = _sample("orders_created_total", source="checkout")
+    promo = _sample("promo_rejections_total", reason="invalid")
+    stock = _sample("inventory_rejections_total", source="checkout")
+
+    assert client.post("/orders/checkout", json=CHECKOUT).status_code == 200
+    assert client.post("/orders/checkout", json={**CHECKOUT, "promo_id": 999}).status_code == 400
+    greedy = {**CHECKOUT, "details": [{"sandwich_id": 1, "amount": 100_000}]}
+    assert client.post("/orders/checkout", json=greedy).status_code == 400
+
+    assert _sample("orders_created_total", source="checkout") == created + 1
+    assert _sample("promo_rejections_total", reason="invalid") == promo + 1
+    assert _sample("inventory_rejections_total", source="checkout") == stock + 1
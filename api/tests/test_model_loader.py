@@ -0,0 +1,70 @@
+"""Schema creation and upgrades done by model_loader.init_db."""
+from datetime import datetime
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from ..controllers import analytics
+from ..dependencies.database import Base
+from ..models import model_loader
+from ..models.order_details import OrderDetail
+from ..models.orders import Order, OrderStatus, OrderType, PaymentStatus
+from ..models.ratings import Rating
+from ..models.sandwiches import Sandwich
+from ..models.schema_version import SchemaVersion
+
+ROLLUPS = {"schema_version", "daily_revenue", "sandwich_rating_stats", "sandwich_daily_sales"}
+
+
+def _legacy_database(path):
+    """Tables as they were before versioning: no rollups, only the id indexes, the old amount index."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[t for t in Base.metadata.sorted_tables if t.name not in ROLLUPS])
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in inspector.get_table_names():
+            for idx in inspector.get_indexes(table):
+                if idx["name"] != f"ix_{table}_id":
+                    conn.execute(text(f"DROP INDEX {idx['name']}"))
+        conn.execute(text("CREATE INDEX ix_order_details_amount ON order_details (amount)"))
+
+    with Session(engine) as db:
+        db.add(Sandwich(id=1, sandwich_name="Club", price=8.5))
+        db.add(Order(
+            id=1, tracking_number="TRK-1", customer_name="A", customer_phone="555", delivery_address="1 St",
+            order_type=OrderType.takeout, status=OrderStatus.completed, payment_status=PaymentStatus.paid,
+            order_date=datetime(2025, 5, 1, 12), subtotal=17, discount=0, tax=1.28, total=18.28,
+        ))
+        db.add(OrderDetail(order_id=1, sandwich_id=1, amount=2))
+        db.add(Rating(sandwich_id=1, stars=4, reason="good"))
+        db.commit()
+    return engine
+
+
+def test_unversioned_database_gets_every_upgrade(tmp_path):
+    engine = _legacy_database(tmp_path / "legacy.db")
+
+    assert model_loader.init_db(engine) == 0
+
+    inspector = inspect(engine)
+    assert ROLLUPS <= set(inspector.get_table_names())
+    assert "ix_orders_order_date_id" in {idx["name"] for idx in inspector.get_indexes("orders")}
+    assert "ix_order_details_amount" not in {idx["name"] for idx in inspector.get_indexes("order_details")}
+    with Session(engine) as db:
+        assert db.get(SchemaVersion, 1).version == model_loader.SCHEMA_VERSION
+        assert analytics.get_daily_revenue(db, datetime(2025, 5, 1).date())["total_revenue"] == 18.28
+        assert analytics.get_most_popular_dishes(db, 1)[0]["total_ordered"] == 2
+        assert analytics.get_rating_summaries(db)[0]["count"] == 1
+
+    assert model_loader.init_db(engine) == model_loader.SCHEMA_VERSION
+    engine.dispose()
+
+
+def test_empty_database_is_created_at_current_version(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+
+    assert model_loader.init_db(engine) is None
+    assert set(Base.metadata.tables) <= set(inspect(engine).get_table_names())
+    with Session(engine) as db:
+        assert db.get(SchemaVersion, 1).version == model_loader.SCHEMA_VERSION
+    engine.dispose()
@@ -0,0 +1,94 @@
+"""Live order status over Server-Sent Events."""
+import asyncio
+import json
+import threading
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from ..controllers import orders
+from ..dependencies import events
+from ..models.orders import Order, OrderStatus
+from ..schemas.orders import OrderUpdate
+
+
+def _parse(message: str) -> tuple[str, dict]:
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_in_process_broker_fans_out_across_threads():
+    broker = events.InProcessBroker()
+
+    async def scenario():
+        async with broker.subscribe("TRK-1") as first, broker.subscribe("TRK-1") as second:
+            assert broker.subscriber_count("TRK-1") == 2
+            thread = threading.Thread(target=broker.publish, args=("TRK-1", {"status": "ready"}))
+            thread.start()
+            thread.join()
+            broker.publish("TRK-2", {"status": "ignored"})
+            got = await asyncio.wait_for(asyncio.gather(first.get(), second.get()), 1)
+        assert broker.subscriber_count("TRK-1") == 0
+        return got
+
+    assert asyncio.run(scenario()) == [{"status": "ready"}, {"status": "ready"}]
+
+
+def test_stream_sends_snapshot_then_transitions(seeded_db, engine, async_engine):
+    order = seeded_db.query(Order).filter(Order.status == OrderStatus.placed).first()
+    sync_session = sessionmaker(bind=engine)
+
+    def staff_update(**changes):
+        with sync_session() as db:
+            orders.update(db, order.id, OrderUpdate(**changes))
+
+    async def scenario():
+        async with async_sessionmaker(async_engine)() as db:
+            stream = await orders.status_events(db, order.tracking_number, is_disconnected=None)
+        received = [_parse(await anext(stream))]
+
+        await asyncio.to_thread(staff_update, payment_status="paid")  # not a status transition
+        await asyncio.to_thread(staff_update, status="preparing")
+        await asyncio.to_thread(staff_update, status="completed")
+        received += [_parse(message) async for message in stream]
+        return received
+
+    received = asyncio.run(scenario())
+    assert [name for name, _ in received] == ["snapshot", "status", "status"]
+    assert received[0][1]["tracking_number"] == order.tracking_number
+    assert [(e["previous_status"], e["status"]) for _, e in received[1:]] == [
+        ("placed", "preparing"), ("preparing", "completed"),
+    ]
+    assert received[2][1]["payment_status"] == "paid"
+    assert events.get_broker().subscriber_count(order.tracking_number) == 0
+
+
+def test_finished_order_stream_ends_after_snapshot(seeded_db, client):
+    order = seeded_db.query(Order).filter(Order.status == OrderStatus.completed).first()
+    response = client.get(f"/customer/orders/track/{order.tracking_number}/events")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [name for name, _ in map(_parse, response.text.strip().split("\n\n"))] == ["snapshot"]
+    assert client.get("/customer/orders/track/NOPE/events").status_code == 404
+
+
+def test_broker_is_swappable(seeded_db, client):
+    class Recording:
+        def __init__(self):
+            self.published = []
+
+        def publish(self, channel, event):
+            self.published.append((channel, event["status"]))
+
+        def subscribe(self, channel):
+            raise NotImplementedError
+
+    order = seeded_db.query(Order).filter(Order.status == OrderStatus.placed).first()
+    original, recording = events.get_broker(), Recording()
+    events.set_broker(recording)
+    try:
+        client.put(f"/orders/{order.id}", json={"status": "ready"})
+    finally:
+        events.set_broker(original)
+    assert recording.published == [(order.tracking_number, "ready")]
@@ -0,0 +1,60 @@
+"""Streaming NDJSON / CSV export of orders in a date range."""
+import csv
+import io
+import json
+from datetime import datetime
+
+from ..controllers import orders
+from ..models.orders import Order
+
+START, END = datetime(2025, 5, 1), datetime(2025, 5, 20)
+
+
+def _expected(db):
+    return (
+        db.query(Order)
+        .filter(Order.order_date >= START, Order.order_date <= END)
+        .order_by(Order.order_date, Order.id)
+        .all()
+    )
+
+
+def _params(fmt):
+    return {"start_date": START.isoformat(), "end_date": END.isoformat(), "format": fmt}
+
+
+def test_ndjson_matches_date_filtered_orders(seeded_db, client):
+    expected = _expected(seeded_db)
+    assert expected, "seed data has no orders in the range"
+
+    response = client.get("/orders/export", params=_params("ndjson"))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [o.id for o in expected]
+    assert list(rows[0]) == orders.EXPORT_COLUMNS
+    assert rows[0]["tracking_number"] == expected[0].tracking_number
+    assert rows[0]["status"] == expected[0].status.value
+    assert rows[0]["total"] == float(expected[0].total)
+
+
+def test_csv_matches_date_filtered_orders(seeded_db, client):
+    expected = _expected(seeded_db)
+
+    response = client.get("/orders/export", params=_params("csv"))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="orders.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [o.id for o in expected]
+    assert rows[-1]["order_date"] == expected[-1].order_date.isoformat()
+    assert rows[-1]["payment_status"] == expected[-1].payment_status.value
+
+
+def test_chunks_cover_every_row(seeded_db, engine):
+    chunks = list(orders.export(START, END, fmt="csv", chunk_size=7, bind=engine))
+
+    assert chunks[0] == ",".join(orders.EXPORT_COLUMNS) + "\r\n"
+    assert sum(chunk.count("\n") for chunk in chunks[1:]) == len(_expected(seeded_db))
@@ -0,0 +1,77 @@
+"""Line edits adjust order totals by delta; a full recompute must agree."""
+from decimal import Decimal
+
+import pytest
+
+from ..controllers import orders
+from ..models.order_details import OrderDetail
+from ..models.orders import Order
+from ..models.sandwiches import Sandwich
+
+
+@pytest.fixture
+def consistent_db(seeded_db):
+    # the seed writes placeholder totals; start from recomputed ones
+    orders.verify_all_order_totals(seeded_db, repair=True)
+    return seeded_db
+
+
+def _mismatches(db):
+    return orders.verify_all_order_totals(db)["mismatched"]
+
+
+def _subtotal(db, order_id):
+    db.expire_all()
+    return db.get(Order, order_id).subtotal
+
+
+def _price(db, sandwich_id):
+    return db.get(Sandwich, sandwich_id).price
+
+
+def test_line_edits_keep_totals_exact(consistent_db, client):
+    db = consistent_db
+    assert _mismatches(db) == 0
+    start = _subtotal(db, 1)
+
+    line = client.post("/orderdetails/", json={"order_id": 1, "sandwich_id": 2, "amount": 2}).json()
+    assert _subtotal(db, 1) == start + 2 * _price(db, 2)
+    assert _mismatches(db) == 0
+
+    client.put(f"/orderdetails/{line['id']}", json={"amount": 3})
+    assert _subtotal(db, 1) == start + 3 * _price(db, 2)
+    assert _mismatches(db) == 0
+
+    client.put(f"/orderdetails/{line['id']}", json={"sandwich_id": 5})
+    assert _subtotal(db, 1) == start + 3 * _price(db, 5)
+    assert _mismatches(db) == 0
+
+    before_2 = _subtotal(db, 2)
+    client.put(f"/orderdetails/{line['id']}", json={"order_id": 2, "amount": 1})
+    assert _subtotal(db, 1) == start
+    assert _subtotal(db, 2) == before_2 + _price(db, 5)
+    assert _mismatches(db) == 0
+
+    assert client.delete(f"/orderdetails/{line['id']}").status_code == 204
+    assert _subtotal(db, 2) == before_2
+    assert _mismatches(db) == 0
+
+
+def test_repair_fixes_drift_after_price_change(consistent_db, client):
+    db = consistent_db
+    affected = {order_id for (order_id,) in db.query(OrderDetail.order_id).filter(OrderDetail.sandwich_id == 1)}
+    client.put("/sandwiches/1", json={"price": float(_price(db, 1)) + 1.25})
+
+    drift = orders.verify_all_order_totals(db)
+    assert drift["mismatched"] == len(affected)
+    assert set(drift["mismatched_ids"]) <= affected
+
+    repaired = orders.verify_all_order_totals(db, repair=True)
+    assert repaired["repaired"] == len(affected)
+    assert _mismatches(db) == 0
+    order_id = min(affected)
+    expected = sum(
+        (Decimal(d.amount) * d.sandwich.price for d in db.query(OrderDetail).filter(OrderDetail.order_id == order_id)),
+        Decimal(0),
+    )
+    assert _subtotal(db, order_id) == expected
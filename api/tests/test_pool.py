@@ -0,0 +1,54 @@
+"""Connection pool statistics behind /staff/db-pool."""
+import pytest
+from sqlalchemy import create_engine, exc
+
+from ..controllers import system
+from ..dependencies.pool import InstrumentedQueuePool, pool_stats
+
+
+@pytest.fixture
+def small_pool(tmp_path):
+    # one pooled connection plus one overflow, and a short wait when both are out
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+        connect_args={"check_same_thread": False},
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_checkouts_overflow_and_timeouts_are_counted(small_pool):
+    first, second = small_pool.connect(), small_pool.connect()
+
+    stats = pool_stats(small_pool)
+    assert stats["pool_class"] == "InstrumentedQueuePool"
+    assert (stats["size"], stats["checked_out"], stats["overflow_in_use"]) == (1, 2, 1)
+    assert stats["acquire"]["count"] == 2
+    assert stats["acquire"]["timeouts"] == 0
+
+    with pytest.raises(exc.TimeoutError):
+        small_pool.connect()
+
+    acquire = pool_stats(small_pool)["acquire"]
+    assert acquire["count"] == 3
+    assert acquire["timeouts"] == 1
+    assert acquire["max_ms"] >= 50
+
+    second.close()
+    first.close()
+    stats = pool_stats(small_pool)
+    assert (stats["checked_out"], stats["idle"], stats["overflow_in_use"]) == (0, 1, 0)
+
+
+def test_route_reports_the_app_pool(small_pool, client, monkeypatch):
+    monkeypatch.setattr(system, "engine", small_pool)
+    with small_pool.connect():
+        body = client.get("/staff/db-pool").json()
+
+    assert body["checked_out"] == 1
+    assert body["acquire"]["count"] == 1
+    assert "async" in body
@@ -0,0 +1,77 @@
+"""Least/most popular dishes read from the sandwich_daily_sales rollup."""
+from collections import Counter
+from datetime import date
+
+from ..controllers import analytics
+from ..models.order_details import OrderDetail
+from ..models.orders import Order, OrderStatus
+from ..models.sandwiches import Sandwich
+
+
+def _expected(db, start=None, end=None, statuses=None):
+    totals = Counter({sid: 0 for (sid,) in db.query(Sandwich.id)})
+    for order, detail in db.query(Order, OrderDetail).join(OrderDetail, OrderDetail.order_id == Order.id):
+        day = order.order_date.date()
+        if start and day < start or end and day > end:
+            continue
+        if statuses and order.status.value not in statuses:
+            continue
+        totals[detail.sandwich_id] += detail.amount
+    return totals
+
+
+def _totals(client, path, **params):
+    rows = client.get(path, params={"limit": 1000, **params}).json()
+    return {row["sandwich_id"]: row["total_ordered"] for row in rows}
+
+
+def test_rankings_match_brute_force(seeded_db, client):
+    analytics.rebuild_sandwich_daily_sales(seeded_db)
+    dates = sorted(d.date() for (d,) in seeded_db.query(Order.order_date))
+    start, end = dates[len(dates) // 4], dates[3 * len(dates) // 4]
+
+    for params in (
+        {},
+        {"start_date": start.isoformat(), "end_date": end.isoformat()},
+        {"status": ["completed", "canceled"]},
+    ):
+        expected = _expected(seeded_db, start if params.get("start_date") else None,
+                             end if params.get("end_date") else None, params.get("status"))
+        assert _totals(client, "/staff/least-popular-dishes", **params) == dict(expected)
+
+        least = client.get("/staff/least-popular-dishes", params={"limit": 3, **params}).json()
+        most = client.get("/staff/most-popular-dishes", params={"limit": 3, **params}).json()
+        assert [r["total_ordered"] for r in least] == sorted(expected.values())[:3]
+        assert [r["total_ordered"] for r in most] == sorted(expected.values(), reverse=True)[:3]
+
+
+def test_writes_keep_rollup_exact(seeded_db, client):
+    analytics.rebuild_sandwich_daily_sales(seeded_db)
+
+    order = client.post("/orders/checkout", json={
+        "customer_name": "Pop", "customer_phone": "555-0101010", "delivery_address": "1 Main St",
+        "order_type": "takeout", "details": [{"sandwich_id": 1, "amount": 2}, {"sandwich_id": 2, "amount": 1}],
+    }).json()
+    line = client.post("/orderdetails/", json={"order_id": order["id"], "sandwich_id": 3, "amount": 1}).json()
+    client.put(f"/orderdetails/{line['id']}", json={"sandwich_id": 4, "amount": 2})
+    client.put(f"/orders/{order['id']}", json={"status": "completed"})
+    other = seeded_db.query(OrderDetail).filter(OrderDetail.order_id != order["id"]).first()
+    client.delete(f"/orderdetails/{other.id}")
+    victim = seeded_db.query(Order).filter(Order.id != order["id"]).first().id
+    client.delete(f"/orders/{victim}")
+
+    seeded_db.expire_all()
+    for params in ({}, {"status": ["completed"]}, {"status": ["placed"]}):
+        assert _totals(client, "/staff/least-popular-dishes", **params) == dict(
+            _expected(seeded_db, statuses=params.get("status")))
+
+    incremental = client.get("/staff/most-popular-dishes", params={"limit": 1000, "status": "completed"}).json()
+    analytics.rebuild_sandwich_daily_sales(seeded_db)
+    assert client.get("/staff/most-popular-dishes", params={"limit": 1000, "status": "completed"}).json() == incremental
+
+
+def test_unknown_status_is_rejected(client):
+    response = client.get("/staff/most-popular-dishes", params={"status": "lost"})
+    assert response.status_code == 400
+    assert OrderStatus.completed.value in response.json()["detail"]
+    assert client.get("/staff/least-popular-dishes", params={"end_date": date.today().isoformat()}).status_code == 200
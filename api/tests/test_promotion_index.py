@@ -0,0 +1,64 @@
+"""In-memory promotion index used to validate promo codes on orders."""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from ..controllers import orders, promotions
+from .conftest import assert_max_queries
+
+PROMO = {"description": "test", "discount_type": "percent", "discount_value": 10}
+
+
+def _promo(id, code, expires_at=None, is_active=True):
+    return SimpleNamespace(id=id, code=code, expires_at=expires_at, is_active=is_active)
+
+
+def test_promotions_drop_out_exactly_at_expiry():
+    t0 = datetime(2025, 6, 1, 12)
+    index = promotions.PromotionIndex([
+        _promo(1, "SOON", t0 + timedelta(seconds=1)),
+        _promo(2, "LATER", t0 + timedelta(days=1)),
+        _promo(3, "OFF", is_active=False),
+        _promo(4, "FOREVER"),
+    ])
+
+    assert index.active(1, t0 + timedelta(seconds=1)).code == "SOON"
+    assert index.active(1, t0 + timedelta(seconds=1, microseconds=1)) is None
+    assert index.active_by_code("SOON", t0 + timedelta(seconds=2)) is None
+    assert index.active_by_code("LATER", t0 + timedelta(seconds=2)).id == 2
+    assert index.active(3, t0) is None and index.get(3).code == "OFF"
+    assert index.active(4, t0 + timedelta(days=3650)).code == "FOREVER"
+    assert index.get(1).code == "SOON"  # expired, but still known
+
+
+def test_order_validation_needs_no_queries(seeded_db, client, record_queries):
+    promo = client.post("/promotions/", json={"code": "HOT10", **PROMO}).json()
+    expired = client.post("/promotions/", json={
+        "code": "OLD10", "expires_at": (datetime.utcnow() - timedelta(days=1)).isoformat(), **PROMO,
+    }).json()
+
+    with assert_max_queries(record_queries, 0):
+        assert orders._validate_promo(seeded_db, promo["id"]).code == "HOT10"
+        for promo_id, detail in ((expired["id"], "expired"), (10**6, "Invalid")):
+            with pytest.raises(HTTPException) as exc:
+                orders._validate_promo(seeded_db, promo_id)
+            assert detail in exc.value.detail
+
+
+def test_write_paths_refresh_the_index(seeded_db, client):
+    promo = client.post("/promotions/", json={"code": "NEW5", **PROMO}).json()
+    assert client.get("/promotions/code/NEW5").json()["id"] == promo["id"]
+
+    client.put(f"/promotions/{promo['id']}", json={"is_active": False})
+    assert client.get("/promotions/code/NEW5").status_code == 404
+    with pytest.raises(HTTPException):
+        orders._validate_promo(seeded_db, promo["id"])
+
+    client.put(f"/promotions/{promo['id']}", json={"is_active": True, "code": "NEW6"})
+    assert client.get("/promotions/code/NEW6").json()["id"] == promo["id"]
+
+    client.delete(f"/promotions/{promo['id']}")
+    assert client.get("/promotions/code/NEW6").status_code == 404
+    assert promotions.promotion_index(seeded_db).get(promo["id"]) is None
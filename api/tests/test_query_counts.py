@@ -0,0 +1,60 @@
+"""
+Query budgets per endpoint: list responses must cost a constant number of
+statements no matter how many rows (and embedded relationships) they hold.
+"""
+from .conftest import assert_max_queries
+
+
+def test_order_details_list_is_constant(seeded_db, client, record_queries):
+    # details + their sandwiches + those sandwiches' tags
+    with assert_max_queries(record_queries, 3):
+        small = client.get("/orderdetails/?limit=5")
+    with assert_max_queries(record_queries, 3):
+        large = client.get("/orderdetails/?limit=500")
+
+    assert small.status_code == large.status_code == 200
+    assert len(large.json()) == 500
+    assert all(d["sandwich"]["sandwich_name"] for d in large.json())
+
+
+def test_order_details_of_one_order(seeded_db, client, record_queries):
+    with assert_max_queries(record_queries, 3):
+        response = client.get("/orderdetails/?order_id=42")
+    assert response.status_code == 200
+
+
+def test_menu_reads_are_constant(seeded_db, client, record_queries):
+    # sandwiches + tags + recipes (BOM) + stock + rating stats on a cold
+    # cache; once cached, only the rating stats lookup
+    with assert_max_queries(record_queries, 5):
+        assert len(client.get("/sandwiches/").json()) == 20
+    with assert_max_queries(record_queries, 1):
+        client.get("/sandwiches/")
+    with assert_max_queries(record_queries, 3):
+        assert client.get("/customer/menu/search").status_code == 200
+
+
+def test_recipes_list_is_constant(seeded_db, client, record_queries):
+    # recipes + sandwiches + tags + resources
+    with assert_max_queries(record_queries, 4):
+        response = client.get("/recipes/")
+    assert len(response.json()) == 60
+
+
+def test_checkout_cost_does_not_grow_with_lines(seeded_db, client, record_queries):
+    def checkout(lines: int):
+        body = {
+            "customer_name": "Test",
+            "customer_phone": "555-0000000",
+            "delivery_address": "1 Test St",
+            "order_type": "takeout",
+            "details": [{"sandwich_id": 1 + i % 20, "amount": 1} for i in range(lines)],
+        }
+        with record_queries() as recorder:
+            response = client.post("/orders/checkout", json=body)
+        assert response.status_code == 200, response.text
+        assert len(response.json()["order_details"]) == lines
+        return recorder.count
+
+    checkout(1)  # loads the recipe index
+    assert checkout(2) == checkout(20)
@@ -0,0 +1,78 @@
+"""Per-sandwich rating aggregates kept by the ratings write paths."""
+from collections import Counter
+
+from ..controllers import analytics
+from ..controllers.sandwiches import menu_cache
+from ..models.ratings import Rating
+from .conftest import assert_max_queries
+
+
+def _expected(db, sandwich_id):
+    stars = [r.stars for r in db.query(Rating).filter(Rating.sandwich_id == sandwich_id)]
+    histogram = Counter(stars)
+    return {
+        "count": len(stars),
+        "average": round(sum(stars) / len(stars), 2) if stars else None,
+        "histogram": {n: histogram.get(n, 0) for n in range(1, 6)},
+    }
+
+
+def _summary(client, sandwich_id):
+    rows = client.get("/staff/ratings", params={"sandwich_id": sandwich_id}).json()
+    if not rows:
+        return {"count": 0, "average": None, "histogram": {n: 0 for n in range(1, 6)}}
+    return {k: rows[0][k] for k in ("count", "average", "histogram")}
+
+
+def _normalize(summary):
+    return {**summary, "histogram": {int(k): v for k, v in summary["histogram"].items()}}
+
+
+def test_writes_keep_aggregates_exact(seeded_db, client, record_queries):
+    analytics.rebuild_rating_stats(seeded_db)
+
+    with assert_max_queries(record_queries, 3):  # insert + stats upsert (+ refresh)
+        created = client.post("/ratings/", json={"sandwich_id": 5, "stars": 1, "reason": "burnt"}).json()
+    client.put(f"/ratings/{created['id']}", json={"stars": 4})
+    moved = client.get("/ratings/", params={"limit": 1}).json()[0]
+    client.put(f"/ratings/{moved['id']}", json={"sandwich_id": 5, "stars": 2})
+    client.delete(f"/ratings/{created['id']}")
+
+    for sandwich_id in (5, moved["sandwich_id"]):
+        assert _normalize(_summary(client, sandwich_id)) == _expected(seeded_db, sandwich_id)
+
+
+def test_rebuild_matches_incremental(seeded_db, client):
+    analytics.rebuild_rating_stats(seeded_db)
+    client.post("/ratings/", json={"sandwich_id": 2, "stars": 5})
+    incremental = client.get("/staff/ratings").json()
+
+    analytics.rebuild_rating_stats(seeded_db)
+    assert client.get("/staff/ratings").json() == incremental
+    averages = [row["average"] for row in incremental]
+    assert averages == sorted(averages)
+
+
+def test_sandwich_reads_include_rating(seeded_db, client, record_queries):
+    analytics.rebuild_rating_stats(seeded_db)
+    menu = {item["id"]: item["rating"] for item in client.get("/sandwiches/").json()}
+    assert _normalize(menu[7]) == _expected(seeded_db, 7)
+
+    generation = menu_cache.generation
+    rating = client.post("/ratings/", json={"sandwich_id": 7, "stars": 3}).json()
+    client.put(f"/ratings/{rating['id']}", json={"stars": 4})
+    assert menu_cache.generation == generation
+    assert _normalize(client.get("/sandwiches/7").json()["rating"]) == _expected(seeded_db, 7)
+    # the cached menu is still used; only the ratings are read again
+    with assert_max_queries(record_queries, 1):
+        menu = {item["id"]: item["rating"] for item in client.get("/sandwiches/").json()}
+    assert _normalize(menu[7]) == _expected(seeded_db, 7)
+
+    client.delete(f"/ratings/{rating['id']}")
+    assert menu_cache.generation == generation
+    menu = {item["id"]: item["rating"] for item in client.get("/sandwiches/").json()}
+    assert _normalize(menu[7]) == _expected(seeded_db, 7)
+
+
+def test_stars_out_of_range_are_rejected(seeded_db, client):
+    assert client.post("/ratings/", json={"sandwich_id": 1, "stars": 6}).status_code == 400
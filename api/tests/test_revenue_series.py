@@ -0,0 +1,64 @@
+"""Revenue time series bucketed by hour, day, week or month."""
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from ..controllers import analytics
+from ..models.orders import Order, PaymentStatus
+from .conftest import assert_max_queries
+
+
+def _paid(db):
+    return db.query(Order).filter(Order.payment_status == PaymentStatus.paid).all()
+
+
+@pytest.mark.parametrize("bucket", ["hour", "day", "week", "month"])
+def test_series_matches_orders(bucket, seeded_db, client, record_queries):
+    analytics.rebuild_daily_revenue(seeded_db)
+    paid = _paid(seeded_db)
+    last = max(o.order_date for o in paid).date()
+    start, end = last - timedelta(days=2 if bucket == "hour" else 60), last
+
+    with assert_max_queries(record_queries, 1):
+        body = client.get("/staff/revenue/series",
+                          params={"start_date": start, "end_date": end, "bucket": bucket}).json()
+
+    expected = defaultdict(lambda: [Decimal("0.00"), 0])
+    for order in paid:
+        if start <= order.order_date.date() <= end:
+            point = expected[analytics._bucket_start(order.order_date, bucket).isoformat()]
+            point[0] += order.total
+            point[1] += 1
+
+    series = body["series"]
+    assert [p["start"] for p in series] == sorted(p["start"] for p in series)
+    assert len({p["start"] for p in series}) == len(series)
+    assert set(expected) <= {p["start"] for p in series}
+    for point in series:
+        revenue, count = expected.get(point["start"], (Decimal("0.00"), 0))
+        assert point["total_revenue"] == float(revenue)
+        assert point["order_count"] == count
+        assert point["average_ticket"] == (float((revenue / count).quantize(Decimal("0.01"))) if count else None)
+
+
+def test_empty_buckets_are_filled(seeded_db, client):
+    analytics.rebuild_daily_revenue(seeded_db)
+    body = client.get("/staff/revenue/series",
+                      params={"start_date": "1999-01-01", "end_date": "1999-03-31", "bucket": "month"}).json()
+    assert [p["start"][:10] for p in body["series"]] == ["1999-01-01", "1999-02-01", "1999-03-01"]
+    assert all(p["order_count"] == 0 and p["average_ticket"] is None for p in body["series"])
+
+    days = client.get("/staff/revenue/series", params={"start_date": "1999-01-01", "end_date": "1999-01-07"}).json()
+    assert len(days["series"]) == 7
+
+
+def test_invalid_ranges_are_rejected(client):
+    today = date.today()
+    assert client.get("/staff/revenue/series", params={
+        "start_date": today, "end_date": today - timedelta(days=1)}).status_code == 400
+    assert client.get("/staff/revenue/series", params={
+        "start_date": today - timedelta(days=365), "end_date": today, "bucket": "hour"}).status_code == 400
+    assert client.get("/staff/revenue/series", params={
+        "start_date": today, "end_date": today, "bucket": "year"}).status_code == 422
@@ -0,0 +1,45 @@
+"""The fast list path must render exactly what the response schemas would."""
+import json
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy.orm import selectinload
+
+from ..dependencies import serialization
+from ..dependencies.pagination import NEXT_CURSOR_HEADER
+from ..models.order_details import OrderDetail
+from ..models.orders import Order
+from ..models.ratings import Rating
+from ..models.sandwiches import Sandwich
+from ..schemas import order_details as od_schema
+from ..schemas import orders as order_schema
+from ..schemas import ratings as rating_schema
+
+
+def _schema_json(schema, items) -> list:
+    adapter = TypeAdapter(list[schema])
+    return json.loads(adapter.dump_json(adapter.validate_python(items, from_attributes=True)))
+
+
+@pytest.mark.parametrize("path, schema, query", [
+    ("/orders/", order_schema.Order,
+     lambda db: db.query(Order).order_by(Order.order_date, Order.id)),
+    ("/orderdetails/", od_schema.OrderDetail,
+     lambda db: db.query(OrderDetail).options(
+         selectinload(OrderDetail.sandwich).selectinload(Sandwich.sandwich_tags)).order_by(OrderDetail.id)),
+    ("/ratings/", rating_schema.Rating,
+     lambda db: db.query(Rating).order_by(Rating.id)),
+])
+def test_list_matches_response_schema(path, schema, query, seeded_db, client):
+    first = client.get(path, params={"limit": 7})
+    second = client.get(path, params={"limit": 7, "cursor": first.headers[NEXT_CURSOR_HEADER]})
+
+    assert first.headers["content-type"] == "application/json"
+    assert first.json() + second.json() == _schema_json(schema, query(seeded_db).limit(14).all())
+
+
+def test_stdlib_fallback_renders_the_same(seeded_db, client, monkeypatch):
+    body = client.get("/orderdetails/", params={"limit": 20}).content
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert client.get("/orderdetails/", params={"limit": 20}).content == body
+
@@ -0,0 +1,80 @@
+"""Conditional GETs and caching on the customer order tracking endpoint."""
+from sqlalchemy.orm import Session
+
+from ..controllers import orders
+from ..models.orders import Order
+from .conftest import assert_max_queries
+
+TRACK = "/customer/orders/track/TRK-00000042"
+
+
+def test_unchanged_order_returns_304_without_queries(seeded_db, client, record_queries):
+    first = client.get(TRACK)
+    assert first.status_code == 200
+    assert first.json()["tracking_number"] == "TRK-00000042"
+    etag = first.headers["etag"]
+
+    with assert_max_queries(record_queries, 0):
+        again = client.get(TRACK, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    assert client.get(TRACK, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_etag_changes_with_status_payment_and_totals(seeded_db, client):
+    order_id = seeded_db.query(Order.id).filter(Order.tracking_number == "TRK-00000042").scalar()
+    seen = {client.get(TRACK).headers["etag"]}
+
+    client.put(f"/orders/{order_id}", json={"status": "ready"})
+    client.put(f"/orders/{order_id}", json={"payment_status": "paid"})
+    seen.add(client.get(TRACK).headers["etag"])
+    client.post("/orderdetails/", json={"order_id": order_id, "sandwich_id": 1, "amount": 1})
+    response = client.get(TRACK, headers={"If-None-Match": ", ".join(seen)})
+    assert response.status_code == 200
+    seen.add(response.headers["etag"])
+
+    assert len(seen) == 3
+    assert response.json()["status"] == "ready"
+    assert response.json()["payment_status"] == "paid"
+
+
+def test_line_writes_and_repair_invalidate_after_commit(seeded_db, client, engine, monkeypatch):
+    first, second = "TRK-00000042", "TRK-00000043"
+    ids = dict(seeded_db.query(Order.tracking_number, Order.id).filter(Order.tracking_number.in_([first, second])))
+
+    # record what a fresh connection sees when each entry is dropped
+    committed = {}
+    invalidate = orders.tracking_cache.invalidate
+
+    def recording_invalidate(tracking_number=None):
+        with Session(engine) as fresh:
+            committed[tracking_number] = fresh.query(Order.subtotal).filter(
+                Order.tracking_number == tracking_number).scalar()
+        invalidate(tracking_number)
+
+    monkeypatch.setattr(orders.tracking_cache, "invalidate", recording_invalidate)
+
+    def assert_fresh(*tracking_numbers):
+        for tracking_number in tracking_numbers:
+            served = client.get(f"/customer/orders/track/{tracking_number}").json()["subtotal"]
+            assert float(committed.pop(tracking_number)) == served
+
+    for tracking_number in ids:
+        client.get(f"/customer/orders/track/{tracking_number}")
+    line = client.post("/orderdetails/", json={"order_id": ids[first], "sandwich_id": 1, "amount": 1}).json()
+    assert_fresh(first)
+    client.put(f"/orderdetails/{line['id']}", json={"order_id": ids[second]})
+    assert_fresh(first, second)
+    client.delete(f"/orderdetails/{line['id']}")
+    assert_fresh(second)
+
+    # the seed's placeholder totals are all wrong, so both orders get repaired
+    orders.verify_all_order_totals(seeded_db, repair=True)
+    assert_fresh(first, second)
+
+
+def test_unknown_tracking_number_is_not_cached(seeded_db, client):
+    assert client.get("/customer/orders/track/NOPE").status_code == 404
+    assert client.get("/customer/orders/track/NOPE").status_code == 404
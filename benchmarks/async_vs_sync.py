@@ -0,0 +1,128 @@
+"""
+Compare the async DB path against the old threadpool (sync Session) path
+for the hot customer endpoints.
+
+Both variants run in one process through httpx's ASGI transport, so the
+numbers show server-side cost (threadpool hand-off, session handling,
+driver I/O) without network noise.
+
+Usage (defaults to a local SQLite file, any DATABASE_URL works):
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.async_vs_sync --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI
+from sqlalchemy.orm import Session
+
+from api.controllers import orders as orders_controller
+from api.controllers import sandwiches as sandwiches_controller
+from api.dependencies.database import Base, SessionLocal, engine, get_db
+from api.models import model_loader
+from api.models.orders import Order
+from api.routers import index
+from api.schemas import orders as order_schema
+from api.schemas import sandwiches as sandwich_schema
+
+# The pre-async versions of the same routes, kept here only for comparison.
+sync_router = APIRouter(prefix="/sync")
+
+
+@sync_router.get("/orders/track/{tracking_number}", response_model=order_schema.Order)
+def track_order(tracking_number: str, db: Session = Depends(get_db)):
+    return orders_controller.read_by_tracking_number(db=db, tracking_number=tracking_number)
+
+
+@sync_router.get("/menu/search", response_model=list[sandwich_schema.Sandwich])
+def search_menu(tag: str | None = None, db: Session = Depends(get_db)):
+    return sandwiches_controller.search_by_tag(db=db, tag_name=tag)
+
+
+@sync_router.get("/sandwiches", response_model=list[sandwich_schema.Sandwich])
+def read_sandwiches(db: Session = Depends(get_db)):
+    return sandwiches_controller.read(db)
+
+
+@sync_router.get("/orders/{item_id}", response_model=order_schema.Order)
+def read_order(item_id: int, db: Session = Depends(get_db)):
+    return orders_controller.read_one(db, item_id=item_id)
+
+
+def build_app() -> FastAPI:
+    Base.metadata.create_all(engine)
+    model_loader.seed_initial_data()
+    app = FastAPI()
+    index.load_routes(app)
+    app.include_router(sync_router)
+    return app
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    k = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[k]
+
+
+async def drive(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
+
+
+async def main(requests: int, concurrency: int) -> None:
+    app = build_app()
+    with SessionLocal() as db:
+        order = db.query(Order).order_by(Order.id).first()
+        tracking, order_id = order.tracking_number, order.id
+
+    pairs = [
+        ("track order", f"/customer/orders/track/{tracking}", f"/sync/orders/track/{tracking}"),
+        ("menu search", "/customer/menu/search", "/sync/menu/search"),
+        ("GET /sandwiches", "/sandwiches/", "/sync/sandwiches"),
+        ("GET /orders/{id}", f"/orders/{order_id}", f"/sync/orders/{order_id}"),
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{requests} requests per endpoint, concurrency {concurrency}, {engine.url.get_backend_name()}")
+        print(f"{'endpoint':<18} {'path':<6} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6}")
+        for label, async_path, sync_path in pairs:
+            for name, path in (("sync", sync_path), ("async", async_path)):
+                await drive(client, path, min(requests, 50), concurrency)  # warm-up
+                r = await drive(client, path, requests, concurrency)
+                print(f"{label:<18} {name:<6} {r['rps']:>9.1f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['errors']:>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,70 @@
+"""
+Measure cold-start time: from spawning a uvicorn worker to the first
+successfully served request.
+
+Usage:
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.cold_start --runs 5
+    python -m benchmarks.cold_start --startup reset   # compare with drop-and-reseed
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_first_request(startup: str, path: str, timeout: float) -> float:
+    port = free_port()
+    env = dict(os.environ, DB_STARTUP=startup)
+    env.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}{path}", timeout=1).status_code < 500:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+            time.sleep(0.01)
+        raise TimeoutError(f"no response within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--startup", default="migrate", choices=["migrate", "reset", "skip"])
+    parser.add_argument("--path", default="/sandwiches/")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    samples = [time_to_first_request(args.startup, args.path, args.timeout) for _ in range(args.runs)]
+    print(
+        f"DB_STARTUP={args.startup}: first request served after "
+        f"median {statistics.median(samples) * 1000:.0f} ms, "
+        f"min {min(samples) * 1000:.0f} ms, max {max(samples) * 1000:.0f} ms over {args.runs} runs"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compare the response_model path with the fast row path on large lists.
+
+The old list routes returned ORM objects with `response_model=list[...]`:
+FastAPI validated every object into the schema (from attributes) and then
+dumped it to JSON. The new routes select column rows, build dicts and
+encode them with orjson (`api.dependencies.serialization`). Both paths
+are timed here on the same rows, split into query and serialization time,
+and their JSON is checked to be identical.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.serialization --rows 10000 --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import selectinload
+
+from api.controllers import order_details as od_controller
+from api.controllers import orders as orders_controller
+from api.dependencies import serialization
+from api.dependencies.database import SessionLocal
+from api.models.order_details import OrderDetail
+from api.models.orders import Order
+from api.models.sandwiches import Sandwich
+from api.schemas import order_details as od_schema
+from api.schemas import orders as order_schema
+
+
+def _orders_orm(db, rows):
+    return db.query(Order).order_by(Order.order_date, Order.id).limit(rows).all()
+
+
+def _orders_rows(db, rows):
+    return orders_controller.read(db, limit=rows)[0]
+
+
+def _details_orm(db, rows):
+    return (
+        db.query(OrderDetail)
+        .options(selectinload(OrderDetail.sandwich).selectinload(Sandwich.sandwich_tags))
+        .order_by(OrderDetail.id)
+        .limit(rows)
+        .all()
+    )
+
+
+def _details_rows(db, rows):
+    return od_controller.read(db, limit=rows)[0]
+
+
+def _response_model(schema):
+    # what FastAPI does for response_model=list[schema]: validate, then dump to JSON
+    adapter = TypeAdapter(list[schema])
+    return lambda items: adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+
+
+CASES = [
+    ("orders", "response_model", _orders_orm, _response_model(order_schema.Order)),
+    ("orders", "rows + orjson", _orders_rows, serialization.dumps),
+    ("orderdetails", "response_model", _details_orm, _response_model(od_schema.OrderDetail)),
+    ("orderdetails", "rows + orjson", _details_rows, serialization.dumps),
+]
+
+
+def measure(load, encode, rows: int, repeat: int) -> tuple[dict, bytes]:
+    query_s, encode_s = [], []
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            start = time.perf_counter()
+            items = load(db, rows)
+            loaded = time.perf_counter()
+            body = encode(items)
+            query_s.append(loaded - start)
+            encode_s.append(time.perf_counter() - loaded)
+    query_ms, encode_ms = statistics.median(query_s) * 1000, statistics.median(encode_s) * 1000
+    return {"query_ms": query_ms, "serialize_ms": encode_ms, "total_ms": query_ms + encode_ms}, body
+
+
+def main(rows: int, repeat: int) -> None:
+    print(f"{rows} rows, median of {repeat}, orjson {'on' if serialization.orjson else 'off'}")
+    print(f"{'endpoint':<14} {'path':<16} {'query ms':>9} {'serialize ms':>13} {'total ms':>9}")
+    bodies = {}
+    for endpoint, path, load, encode in CASES:
+        r, body = measure(load, encode, rows, repeat)
+        bodies.setdefault(endpoint, []).append(json.loads(body))
+        print(f"{endpoint:<14} {path:<16} {r['query_ms']:>9.1f} {r['serialize_ms']:>13.1f} {r['total_ms']:>9.1f}")
+    for endpoint, (old, new) in bodies.items():
+        if old != new:
+            raise SystemExit(f"{endpoint}: the two paths produced different JSON")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
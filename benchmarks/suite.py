@@ -0,0 +1,186 @@
+"""
+Repeatable load benchmark for the main API areas: orders, order details,
+staff analytics and customer order tracking.
+
+Load a dataset first with `benchmarks.synthetic`, then run the suite
+against the same DATABASE_URL. Request parameters (ids, date ranges,
+tracking numbers) are drawn from a seeded RNG, so two runs against the
+same dataset send the same requests. Write scenarios add rows; reload the
+dataset between runs you want to compare exactly.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.synthetic --reset --orders 100000 --months 12 --end 2025-06-01
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.suite --requests 1000 --concurrency 20 --output before.json
+    python -m benchmarks.suite --group orders --group tracking --compare before.json
+
+Requests go through httpx's ASGI transport in this process, so the numbers
+are server-side cost without network noise.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+import httpx
+from sqlalchemy import func, select
+
+from api.dependencies.database import engine
+from api.main import app
+from api.models.orders import Order
+from api.models.sandwiches import Sandwich
+from benchmarks.async_vs_sync import percentile
+
+# per-request log lines would dominate the measurement
+for name in ("api.sql", "httpx"):
+    logging.getLogger(name).setLevel(logging.WARNING)
+
+
+@dataclass
+class Scenario:
+    group: str
+    name: str
+    # (rng, dataset) -> (method, url, json body or None)
+    request: Callable[[random.Random, dict], tuple]
+
+
+def _date_range(rng, data, days: int) -> str:
+    start = data["first_date"] + timedelta(days=rng.randrange(max(1, data["span_days"] - days)))
+    return f"start_date={start:%Y-%m-%d}&end_date={start + timedelta(days=days):%Y-%m-%d}"
+
+
+def _cart(rng, data, lines: int) -> list[dict]:
+    return [{"sandwich_id": rng.choice(data["sandwich_ids"]), "amount": rng.randint(1, 2)} for _ in range(lines)]
+
+
+SCENARIOS = [
+    Scenario("orders", "list one day", lambda rng, d: ("GET", f"/orders/?{_date_range(rng, d, 1)}&limit=100", None)),
+    Scenario("orders", "list 30 days", lambda rng, d: ("GET", f"/orders/?{_date_range(rng, d, 30)}&limit=500", None)),
+    Scenario("orders", "read one", lambda rng, d: ("GET", f"/orders/{rng.randint(d['min_order'], d['max_order'])}", None)),
+    Scenario("orders", "checkout 3 lines", lambda rng, d: ("POST", "/orders/checkout", {
+        "customer_name": "Bench", "customer_phone": "555-0000000", "delivery_address": "1 Bench St",
+        "order_type": "takeout", "details": _cart(rng, d, 3),
+    })),
+    Scenario("orderdetails", "list by order", lambda rng, d: (
+        "GET", f"/orderdetails/?order_id={rng.randint(d['min_order'], d['max_order'])}", None)),
+    Scenario("orderdetails", "list page", lambda rng, d: ("GET", "/orderdetails/?limit=500", None)),
+    Scenario("orderdetails", "add line", lambda rng, d: ("POST", "/orderdetails/", {
+        "order_id": rng.randint(d["min_order"], d["max_order"]), **_cart(rng, d, 1)[0],
+    })),
+    Scenario("analytics", "least popular", lambda rng, d: ("GET", "/staff/least-popular-dishes?limit=5", None)),
+    Scenario("analytics", "most popular 30 days", lambda rng, d: (
+        "GET", f"/staff/most-popular-dishes?limit=5&{_date_range(rng, d, 30)}&status=completed", None)),
+    Scenario("analytics", "complaints", lambda rng, d: ("GET", "/staff/complaints?max_stars=2&limit=100", None)),
+    Scenario("analytics", "daily revenue", lambda rng, d: (
+        "GET", f"/staff/revenue?date={d['first_date'] + timedelta(days=rng.randrange(d['span_days'])):%Y-%m-%d}", None)),
+    Scenario("analytics", "revenue 30d by day", lambda rng, d: (
+        "GET", f"/staff/revenue/series?{_date_range(rng, d, 30)}&bucket=day", None)),
+    Scenario("analytics", "revenue 7d by hour", lambda rng, d: (
+        "GET", f"/staff/revenue/series?{_date_range(rng, d, 7)}&bucket=hour", None)),
+    Scenario("tracking", "track order", lambda rng, d: (
+        "GET", f"/customer/orders/track/{rng.choice(d['tracking_numbers'])}", None)),
+    Scenario("tracking", "menu search", lambda rng, d: ("GET", "/customer/menu/search", None)),
+]
+GROUPS = sorted({s.group for s in SCENARIOS})
+
+
+def load_dataset(sample: int = 5_000, seed: int = 0) -> dict:
+    """The id and date ranges scenarios draw their parameters from."""
+    with engine.connect() as conn:
+        min_order, max_order, first, last = conn.execute(
+            select(func.min(Order.id), func.max(Order.id), func.min(Order.order_date), func.max(Order.order_date))
+        ).one()
+        if max_order is None:
+            raise SystemExit("No orders found; load data with `python -m benchmarks.synthetic` first.")
+        ids = random.Random(seed).sample(range(min_order, max_order + 1), min(sample, max_order - min_order + 1))
+        tracking = conn.execute(select(Order.tracking_number).where(Order.id.in_(ids))).scalars().all()
+        sandwich_ids = conn.execute(select(Sandwich.id)).scalars().all()
+    return {
+        "min_order": min_order,
+        "max_order": max_order,
+        "first_date": first.date(),
+        "span_days": max(1, (last - first).days),
+        "tracking_numbers": sorted(tracking),
+        "sandwich_ids": sandwich_ids,
+    }
+
+
+async def run(client: httpx.AsyncClient, scenario: Scenario, data: dict, requests: int, concurrency: int, seed: int) -> dict:
+    rng = random.Random(f"{seed}:{scenario.group}:{scenario.name}")
+    planned = iter([scenario.request(rng, data) for _ in range(requests)])
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for method, url, body in planned:
+            start = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
+
+
+async def main(groups: list[str], requests: int, concurrency: int, warmup: int, seed: int,
+               output: str | None, compare: str | None) -> None:
+    data = load_dataset(seed=seed)
+    baseline = json.load(open(compare)) if compare else {}
+    results = {}
+
+    print(f"{requests} requests per scenario, concurrency {concurrency}, "
+          f"{engine.url.get_backend_name()}, orders {data['min_order']}..{data['max_order']}")
+    print(f"{'scenario':<28} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}"
+          + ("  p95 vs baseline" if baseline else ""))
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for scenario in SCENARIOS:
+            if scenario.group not in groups:
+                continue
+            key = f"{scenario.group}/{scenario.name}"
+            if warmup:
+                await run(client, scenario, data, warmup, concurrency, seed + 1)
+            r = results[key] = await run(client, scenario, data, requests, concurrency, seed)
+            line = (f"{key:<28} {r['rps']:>8.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+                    f"{r['p99_ms']:>8.2f} {r['errors']:>6}")
+            if key in baseline:
+                line += f"  {(r['p95_ms'] / baseline[key]['p95_ms'] - 1) * 100:+.0f}%"
+            print(line)
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--group", action="append", choices=GROUPS, help="Run only these groups (repeatable).")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write results as JSON.")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare p95 against.")
+    args = parser.parse_args()
+    asyncio.run(main(args.group or GROUPS, args.requests, args.concurrency, args.warmup, args.seed,
+                     args.output, args.compare))
@@ -0,0 +1,245 @@
+"""
+Bulk-load a large, realistic dataset for benchmarking.
+
+Generates a menu (resources, sandwiches, recipes, tags), promotions, and
+months of orders with their line items and ratings. Order dates follow a
+lunch/dinner curve with busier weekends; totals are computed with the same
+rules as checkout, so `/orders/totals/verify` reports no mismatches and the
+revenue rollups are rebuilt from the loaded rows.
+
+Rows are written with executemany INSERTs in chunks, which works the same
+on SQLite and MySQL:
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.synthetic --reset --orders 200000 --months 12
+    DATABASE_URL=mysql+pymysql://root:pw@localhost/sandwich_bench python -m benchmarks.synthetic --reset
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from api.controllers import analytics
+from api.controllers.orders import _apply_totals
+from api.dependencies.database import Base, engine as default_engine
+from api.models import model_loader
+from api.models.order_details import OrderDetail
+from api.models.orders import Order, OrderStatus, OrderType, PaymentStatus
+from api.models.promotions import Promotion
+from api.models.ratings import Rating
+from api.models.recipes import Recipe
+from api.models.resources import Resource
+from api.models.sandwiches import Sandwich
+from api.models.tags import SandwichTag, Tag
+
+TAGS = ["vegetarian", "vegan", "spicy", "kids", "gluten_free", "hot", "cold", "signature", "low_carb", "breakfast"]
+PRICES = [4.5, 5, 6, 6.5, 7, 7.5, 8, 8.5, 9, 10.5, 12]
+REASONS = {
+    1: ["cold and soggy", "wrong order", "bread was stale", "waited too long"],
+    2: ["too dry", "small portion", "too salty", "missing sauce"],
+    3: ["okay", "average", "fine for the price"],
+    4: ["tasty", "good value", "fresh bread"],
+    5: ["excellent", "best sandwich in town", "fresh and tasty", "perfect"],
+}
+# relative order volume per hour of day: lunch and dinner peaks
+HOUR_WEIGHTS = [0, 0, 0, 0, 0, 0, 1, 2, 3, 3, 4, 9, 12, 8, 4, 3, 4, 7, 9, 7, 4, 2, 1, 0]
+
+
+def _weighted(rng: random.Random, options: dict):
+    return rng.choices(list(options), weights=list(options.values()))[0]
+
+
+def _order_dates(rng: random.Random, count: int, start: datetime, end: datetime) -> list[datetime]:
+    """`count` timestamps between start and end, busier at meal times and weekends."""
+    days = max(1, (end - start).days)
+    day_weights = [1.3 if (start + timedelta(days=d)).weekday() >= 5 else 1.0 for d in range(days)]
+    picked_days = rng.choices(range(days), weights=day_weights, k=count)
+    picked_hours = rng.choices(range(24), weights=HOUR_WEIGHTS, k=count)
+    return sorted(
+        start + timedelta(days=d, hours=h, seconds=rng.randrange(3600))
+        for d, h in zip(picked_days, picked_hours)
+    )
+
+
+def generate(
+    engine=default_engine,
+    orders: int = 50_000,
+    months: int = 6,
+    sandwiches: int = 40,
+    resources: int = 25,
+    promotions: int = 20,
+    ratings_per_order: float = 0.3,
+    chunk_size: int = 5_000,
+    seed: int = 42,
+    end: datetime | None = None,
+) -> dict:
+    """
+    Append a synthetic dataset to the database behind `engine` and return
+    the number of rows written per table. The same seed and `end` always
+    produce the same data.
+    """
+    rng = random.Random(seed)
+    end = end or datetime.utcnow().replace(microsecond=0)
+    start = end - timedelta(days=30 * months)
+    counts = {}
+
+    with engine.begin() as conn:
+        base_id = {
+            model: conn.execute(select(func.coalesce(func.max(model.id), 0))).scalar()
+            for model in (Resource, Sandwich, Tag, Promotion, Order)
+        }
+
+        resource_ids = [base_id[Resource] + i for i in range(1, resources + 1)]
+        conn.execute(insert(Resource), [
+            # effectively unlimited stock so write benchmarks never run out
+            {"id": rid, "item": f"Synthetic ingredient {rid}", "amount": 10**9}
+            for rid in resource_ids
+        ])
+
+        sandwich_ids = [base_id[Sandwich] + i for i in range(1, sandwiches + 1)]
+        prices = {sid: Decimal(str(rng.choice(PRICES))) for sid in sandwich_ids}
+        conn.execute(insert(Sandwich), [
+            {"id": sid, "sandwich_name": f"Synthetic sandwich {sid}", "price": prices[sid]}
+            for sid in sandwich_ids
+        ])
+        conn.execute(insert(Recipe), [
+            {"sandwich_id": sid, "resource_id": rid, "amount": rng.randint(1, 3)}
+            for sid in sandwich_ids
+            for rid in rng.sample(resource_ids, rng.randint(2, min(5, len(resource_ids))))
+        ])
+
+        tag_ids = [base_id[Tag] + i for i in range(1, len(TAGS) + 1)]
+        conn.execute(insert(Tag), [
+            {"id": tid, "name": f"{name}_{tid}", "display_name": name.replace("_", " ").title()}
+            for tid, name in zip(tag_ids, TAGS)
+        ])
+        conn.execute(insert(SandwichTag), [
+            {"sandwich_id": sid, "tag_id": tid}
+            for sid in sandwich_ids
+            for tid in rng.sample(tag_ids, rng.randint(0, 3))
+        ])
+
+        promos = []
+        for i in range(1, promotions + 1):
+            pid = base_id[Promotion] + i
+            percent = rng.random() < 0.6
+            promos.append(SimpleNamespace(
+                id=pid,
+                code=f"SYN{pid:05d}",
+                description="Synthetic promotion",
+                discount_type="percent" if percent else "amount",
+                discount_value=Decimal(rng.choice([5, 10, 15, 20]) if percent else rng.choice([1, 2, 3, 5])),
+                expires_at=end + timedelta(days=rng.randint(-90, 90)),
+                is_active=rng.random() < 0.8,
+            ))
+        conn.execute(insert(Promotion), [vars(p) for p in promos])
+        active_promos = [p for p in promos if p.is_active]
+
+        counts.update(resources=resources, sandwiches=sandwiches, promotions=promotions, tags=len(tag_ids))
+
+        dates = _order_dates(rng, orders, start, end)
+        statuses = {s: w for s, w in zip(OrderStatus, (2, 1, 1, 1, 90, 5))}
+        payments = {PaymentStatus.paid: 90, PaymentStatus.pending: 6, PaymentStatus.failed: 4}
+        written = {"orders": 0, "order_details": 0, "ratings": 0}
+
+        for offset in range(0, orders, chunk_size):
+            order_rows, detail_rows, rating_rows = [], [], []
+            for n, order_date in enumerate(dates[offset:offset + chunk_size], start=offset + 1):
+                order_id = base_id[Order] + n
+                lines = [(rng.choice(sandwich_ids), rng.choices((1, 2, 3), (80, 15, 5))[0])
+                         for _ in range(rng.choices((1, 2, 3, 4, 5), (35, 30, 20, 10, 5))[0])]
+                promo = rng.choice(active_promos) if active_promos and rng.random() < 0.15 else None
+
+                totals = SimpleNamespace()
+                _apply_totals(totals, sum((prices[sid] * amount for sid, amount in lines), Decimal("0.00")), promo)
+                order_rows.append({
+                    "id": order_id,
+                    "tracking_number": f"SYN-{order_id:010d}",
+                    "customer_name": f"Customer {rng.randint(1, orders // 3 + 1)}",
+                    "customer_phone": f"555-{rng.randint(0, 9_999_999):07d}",
+                    "delivery_address": f"{rng.randint(1, 9999)} Synthetic Ave",
+                    "order_type": _weighted(rng, {OrderType.takeout: 60, OrderType.delivery: 40}),
+                    "status": _weighted(rng, statuses),
+                    "payment_status": _weighted(rng, payments),
+                    "order_date": order_date,
+                    "subtotal": totals.subtotal,
+                    "discount": totals.discount,
+                    "tax": totals.tax,
+                    "total": totals.total,
+                    "promo_id": promo.id if promo else None,
+                })
+                detail_rows.extend(
+                    {"order_id": order_id, "sandwich_id": sid, "amount": amount} for sid, amount in lines
+                )
+                if rng.random() < ratings_per_order:
+                    stars = rng.choices((1, 2, 3, 4, 5), (8, 10, 17, 30, 35))[0]
+                    rating_rows.append({
+                        "sandwich_id": rng.choice(lines)[0],
+                        "stars": stars,
+                        "reason": rng.choice(REASONS[stars]),
+                        "created_at": order_date + timedelta(hours=rng.randint(1, 72)),
+                    })
+
+            conn.execute(insert(Order), order_rows)
+            conn.execute(insert(OrderDetail), detail_rows)
+            if rating_rows:
+                conn.execute(insert(Rating), rating_rows)
+            written["orders"] += len(order_rows)
+            written["order_details"] += len(detail_rows)
+            written["ratings"] += len(rating_rows)
+
+        counts.update(written)
+
+    with Session(bind=engine) as db:
+        counts["daily_revenue_days"] = analytics.rebuild_daily_revenue(db)
+        counts["rated_sandwiches"] = analytics.rebuild_rating_stats(db)
+        counts["sandwich_daily_sales"] = analytics.rebuild_sandwich_daily_sales(db)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--sandwiches", type=int, default=40)
+    parser.add_argument("--resources", type=int, default=25)
+    parser.add_argument("--promotions", type=int, default=20)
+    parser.add_argument("--ratings-per-order", type=float, default=0.3)
+    parser.add_argument("--chunk-size", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None,
+                        help="Last order date (YYYY-MM-DD); defaults to now.")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first.")
+    args = parser.parse_args(argv)
+
+    if args.reset:
+        Base.metadata.drop_all(default_engine)
+    model_loader.init_db()
+
+    started = time.perf_counter()
+    counts = generate(
+        orders=args.orders,
+        months=args.months,
+        sandwiches=args.sandwiches,
+        resources=args.resources,
+        promotions=args.promotions,
+        ratings_per_order=args.ratings_per_order,
+        chunk_size=args.chunk_size,
+        seed=args.seed,
+        end=args.end,
+    )
+    elapsed = time.perf_counter() - started
+    print(f"Loaded into {default_engine.url.render_as_string(hide_password=True)} in {elapsed:.1f}s:")
+    for table, count in counts.items():
+        print(f"  {table:<20} {count:>10}")
+
+
+if __name__ == "__main__":
+    main()